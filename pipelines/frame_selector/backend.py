@@ -0,0 +1,189 @@
+"""
+Inference Backends
+
+Runs the frame selection models with eager PyTorch, or with an exported
+TorchScript / ONNX artifact quantized to int8 for CPU-only nodes.
+
+Exported artifacts are cached on disk, keyed by model name, checkpoint,
+backend and the versions that shape the exported graph, so the export and
+quantization only happen on the first start after a model or library change.
+"""
+
+# === Standard Library ===
+import os
+from pathlib import Path
+
+# === Third-party Libraries ===
+import torch
+import transformers
+
+
+BACKENDS = ("torch", "torchscript-int8", "onnx", "onnx-int8")
+
+DEFAULT_ARTIFACT_DIR = Path(os.getenv("SATORI_MODEL_CACHE", Path.home() / ".cache" / "satori" / "models"))
+
+ONNX_OPSET = 17
+
+
+class TorchBackend:
+    """
+    Eager PyTorch inference.
+
+    :param module: Model taking and returning tensors.
+    :type module: torch.nn.Module
+    """
+
+    def __init__(self, module: torch.nn.Module):
+        self.module = module.eval()
+
+    @torch.no_grad()
+    def __call__(self, *inputs):
+        return self.module(*inputs)
+
+
+class TorchScriptInt8Backend(TorchBackend):
+    """
+    TorchScript inference with dynamically int8-quantized linear layers.
+
+    :param module: Model taking and returning tensors.
+    :type module: torch.nn.Module
+    :param example_inputs: Inputs used to trace the model.
+    :type example_inputs: tuple[torch.Tensor]
+    :param path: Artifact path; the traced model is loaded from it if it exists.
+    :type path: Path
+    """
+
+    def __init__(self, module: torch.nn.Module, example_inputs: tuple, path: Path):
+        if not path.exists():
+            quantized = torch.ao.quantization.quantize_dynamic(
+                module.cpu().eval(), {torch.nn.Linear}, dtype=torch.qint8
+            )
+            with torch.no_grad():
+                traced = torch.jit.trace(quantized, tuple(t.cpu() for t in example_inputs))
+            save_atomically(path, lambda tmp: torch.jit.save(traced, str(tmp)))
+        super().__init__(torch.jit.load(str(path), map_location="cpu"))
+
+    @torch.no_grad()
+    def __call__(self, *inputs):
+        return self.module(*(t.cpu() for t in inputs))
+
+
+class OnnxBackend:
+    """
+    ONNX Runtime inference on CPU, optionally with int8 dynamic quantization.
+
+    :param module: Model taking and returning tensors.
+    :type module: torch.nn.Module
+    :param example_inputs: Inputs used to export the model.
+    :type example_inputs: tuple[torch.Tensor]
+    :param path: Artifact path of the fp32 model; the int8 model sits next to it.
+    :type path: Path
+    :param input_names: Names of the model inputs.
+    :type input_names: list[str]
+    :param output_names: Names of the model outputs.
+    :type output_names: list[str]
+    :param dynamic_axes: Dynamic axes by input or output name.
+    :type dynamic_axes: dict
+    :param quantize: Whether to run the int8-quantized model.
+    :type quantize: bool
+    """
+
+    def __init__(self, module, example_inputs, path, input_names, output_names, dynamic_axes, quantize=False):
+        try:
+            import onnxruntime
+        except ImportError as e:
+            raise ImportError("The onnx inference backends require the onnxruntime package") from e
+
+        if not path.exists():
+            save_atomically(path, lambda tmp: torch.onnx.export(
+                module.cpu().eval(), tuple(t.cpu() for t in example_inputs), str(tmp),
+                input_names=list(input_names), output_names=list(output_names),
+                dynamic_axes=dynamic_axes, opset_version=ONNX_OPSET,
+            ))
+        if quantize:
+            fp32_path, path = path, path.with_name(path.stem + "-int8.onnx")
+            if not path.exists():
+                from onnxruntime.quantization import quantize_dynamic, QuantType
+                save_atomically(path, lambda tmp: quantize_dynamic(
+                    str(fp32_path), str(tmp), weight_type=QuantType.QInt8
+                ))
+
+        self.input_names = input_names
+        self.session = onnxruntime.InferenceSession(str(path), providers=["CPUExecutionProvider"])
+
+    def __call__(self, *inputs):
+        feeds = {name: t.detach().cpu().numpy() for name, t in zip(self.input_names, inputs)}
+        outputs = [torch.from_numpy(output) for output in self.session.run(None, feeds)]
+        return outputs[0] if len(outputs) == 1 else tuple(outputs)
+
+
+def save_atomically(path: Path, save):
+    """Writes an artifact through a temporary file, so that a crash never leaves a partial artifact."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        save(tmp)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def artifact_stem(name: str, checkpoint: str = None) -> str:
+    """
+    Builds the file name stem of an exported artifact.
+
+    :param name: Name of the exported module.
+    :type name: str
+    :param checkpoint: Pretrained checkpoint of the module, e.g. a Hugging Face model id.
+    :type checkpoint: str or None
+    :returns: Stem unique per module, checkpoint, and transformers and torch versions.
+    :rtype: str
+    """
+    parts = [name]
+    if checkpoint:
+        parts.append(checkpoint.replace("/", "--"))
+    parts += [f"transformers{transformers.__version__}", f"torch{torch.__version__}"]
+    return "-".join(parts).replace("+", "_")
+
+
+def load_backend(backend: str, module: torch.nn.Module, example_inputs: tuple, name: str,
+                 input_names: list, output_names: list = ("output",), dynamic_axes: dict = None,
+                 artifact_dir=None, checkpoint: str = None):
+    """
+    Wraps a model in the selected inference backend.
+
+    :param backend: One of ``torch``, ``torchscript-int8``, ``onnx`` or ``onnx-int8``.
+    :type backend: str
+    :param module: Model taking and returning tensors.
+    :type module: torch.nn.Module
+    :param example_inputs: Inputs used to trace or export the model.
+    :type example_inputs: tuple[torch.Tensor]
+    :param name: Name of the exported module, e.g. ``clip-image-encoder``.
+    :type name: str
+    :param input_names: Names of the model inputs.
+    :type input_names: list[str]
+    :param output_names: Names of the model outputs (ONNX only).
+    :type output_names: list[str]
+    :param dynamic_axes: Dynamic axes by input or output name (ONNX only).
+    :type dynamic_axes: dict or None
+    :param artifact_dir: Directory of cached artifacts; defaults to ``DEFAULT_ARTIFACT_DIR``.
+    :type artifact_dir: str or Path or None
+    :param checkpoint: Pretrained checkpoint of the module; part of the artifact key.
+    :type checkpoint: str or None
+    :returns: Callable taking and returning tensors.
+    :rtype: Callable
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown inference backend {backend!r}, expected one of {BACKENDS}")
+    if backend == "torch":
+        return TorchBackend(module)
+
+    artifact_dir = Path(artifact_dir) if artifact_dir else DEFAULT_ARTIFACT_DIR
+    stem = artifact_stem(name, checkpoint)
+    if backend == "torchscript-int8":
+        return TorchScriptInt8Backend(module, example_inputs, artifact_dir / f"{stem}-int8.pt")
+    return OnnxBackend(
+        module, example_inputs, artifact_dir / f"{stem}-opset{ONNX_OPSET}.onnx", input_names, output_names,
+        dynamic_axes or {}, quantize=backend == "onnx-int8",
+    )
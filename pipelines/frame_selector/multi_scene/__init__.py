@@ -13,37 +13,197 @@ import numpy as np
 from PIL import Image
 from transformers import CLIPProcessor, CLIPModel
 
+from ..backend import load_backend
+
+
+UNRELATED_SCENE = "unrelated scene"
+# Generic on purpose: it must not grow with the task plans.
+UNRELATED_DESCRIPTION = "An everyday scene where no task is being done"
+
+# Context length of the CLIP text tower, in tokens.
+CLIP_MAX_TEXT_LENGTH = 77
+
+
+def describe_task_plan(task_plan: dict) -> str:
+    """
+    Builds the scene description of a task plan.
+
+    Uses the plan's ``scene_description`` if given, otherwise describes the
+    desired task and its first few objects.
+
+    :param task_plan: Task plan with ``desired_task`` and optional ``objects``.
+    :type task_plan: dict
+    :returns: Scene description matched against frames.
+    :rtype: str
+    """
+    if task_plan.get("scene_description"):
+        return task_plan["scene_description"]
+    description = f"A person doing the task '{task_plan['desired_task']}'"
+    objects = task_plan.get("objects") or []
+    if objects:
+        description += ", with items like " + ", ".join(obj.lower() for obj in objects[:5]) + " visible"
+    return description
+
+
+def build_scene_vocabulary(task_plans) -> tuple:
+    """
+    Derives scene labels and descriptions from task plans.
+
+    Each plan contributes one scene named after its desired task, followed by
+    a generic unrelated scene.
+
+    :param task_plans: Task plans.
+    :type task_plans: Iterable[dict]
+    :returns: Scene labels and descriptions.
+    :rtype: tuple[list[str], list[str]]
+    """
+    task_plans = list(task_plans)
+    scenes = [task_plan["desired_task"] for task_plan in task_plans]
+    descriptions = [describe_task_plan(task_plan) for task_plan in task_plans]
+    scenes.append(UNRELATED_SCENE)
+    descriptions.append(UNRELATED_DESCRIPTION)
+    return scenes, descriptions
+
+
+class ClipImageEncoder(torch.nn.Module):
+    """CLIP image tower as a module mapping pixel values to image embeddings, for export."""
+
+    def __init__(self, model: CLIPModel):
+        super().__init__()
+        self.model = model
+
+    def forward(self, pixel_values):
+        return self.model.get_image_features(pixel_values=pixel_values)
+
 
 class MultiSceneClassificationModule:
     """
     Scene classification using OpenAI CLIP for detecting relevant task-related scenes.
+
+    The scene vocabulary is derived from task plans, usually just the active
+    one. Text embeddings are cached per scene description, so switching back
+    to a task plan seen before only stacks cached embeddings instead of
+    re-running the text tower.
+
+    The image tower runs on the selected inference backend (see
+    ``load_backend``); the text tower always runs in PyTorch, as its output
+    is cached.
+
+    :param task_plans: Task plans defining the scenes; defaults to the built-in task plans.
+    :type task_plans: Iterable[dict] or None
+    :param backend: Inference backend of the image tower.
+    :type backend: str
+    :param artifact_dir: Directory of exported model artifacts.
+    :type artifact_dir: str or None
     """
 
-    def __init__(self):
-        self.device = torch.device("cuda:1" if torch.cuda.is_available() else "cpu")
-        self.model = CLIPModel.from_pretrained("openai/clip-vit-base-patch32").to(self.device)
-        self.processor = CLIPProcessor.from_pretrained("openai/clip-vit-base-patch32")
+    def __init__(self, task_plans=None, backend: str = "torch", artifact_dir: str = None):
+        # Exported backends run on CPU.
+        self.device = torch.device("cuda:1" if torch.cuda.is_available() and backend == "torch" else "cpu")
+        checkpoint = "openai/clip-vit-base-patch32"
+        self.model = CLIPModel.from_pretrained(checkpoint).to(self.device)
+        self.processor = CLIPProcessor.from_pretrained(checkpoint)
         self.model.eval()
+        self.image_encoder = load_backend(
+            backend, ClipImageEncoder(self.model), (torch.zeros(1, 3, 224, 224, device=self.device),),
+            name="clip-image-encoder", checkpoint=checkpoint, input_names=["pixel_values"],
+            dynamic_axes={"pixel_values": {0: "batch"}, "output": {0: "batch"}},
+            artifact_dir=artifact_dir,
+        )
 
-        self.scenes = [
-            "coffee making",
-            "room cleaning with mop",
-            "connecting Nintendo Switch to monitor",
-            "arranging flowers",
-            "unrelated scene"
-        ]
+        self.text_embed_cache = {}
+        self.vocabulary = None
+        if task_plans is None:
+            # Imported here, as the task pipelines import the frame selector.
+            from pipelines.task.task_plans import TASK_PLAN_MAP
+            task_plans = TASK_PLAN_MAP.values()
+        self.set_task_plans(task_plans)
 
-        self.scene_descriptions = [
-            "A person making coffee, with items like a coffee machine, grinder, kettle, or coffee beans visible",
-            "Someone cleaning a room with a mop, showing cleaning supplies and wet floor",
-            "Connecting a Nintendo Switch console to a TV or monitor, with cables and gaming equipment visible",
-            "Arranging flowers in a vase, with various flowers and floral supplies present",
-            "A scene unrelated to coffee making, room cleaning, Nintendo Switch setup, or flower arranging"
-        ]
+    @torch.no_grad()
+    def encode_text(self, descriptions: list) -> torch.Tensor:
+        """
+        Encodes scene descriptions with the CLIP text tower.
+
+        Only descriptions missing from the cache are encoded; descriptions
+        longer than the CLIP context are truncated.
+
+        :param descriptions: Scene descriptions.
+        :type descriptions: list[str]
+        :returns: L2-normalized text embeddings, one row per description.
+        :rtype: torch.Tensor
+        """
+        missing = [d for d in dict.fromkeys(descriptions) if d not in self.text_embed_cache]
+        if missing:
+            text_inputs = self.processor(
+                text=missing, padding=True, truncation=True, max_length=CLIP_MAX_TEXT_LENGTH, return_tensors="pt"
+            ).to(self.device)
+            text_embeds = self.model.get_text_features(**text_inputs)
+            text_embeds = text_embeds / text_embeds.norm(dim=-1, keepdim=True)
+            self.text_embed_cache.update(zip(missing, text_embeds))
+        return torch.stack([self.text_embed_cache[d] for d in descriptions])
+
+    def set_scenes(self, scenes: list, scene_descriptions: list):
+        """
+        Sets the scene vocabulary and precomputes its text embeddings.
+
+        The text tower only runs here, so classifying a frame costs a single
+        image-tower pass and a dot product with the cached embeddings.
 
-        self.text_inputs = self.processor(text=self.scene_descriptions, padding=True, return_tensors="pt").to(self.device)
+        :param scenes: Scene labels.
+        :type scenes: list[str]
+        :param scene_descriptions: Descriptions matched against frames, one per scene.
+        :type scene_descriptions: list[str]
+        """
+        if len(scenes) != len(scene_descriptions):
+            raise ValueError("Each scene needs exactly one description")
+        if self.vocabulary is not None and (list(scenes), list(scene_descriptions)) == (self.scenes, self.scene_descriptions):
+            return
+        # Swapped in one assignment, as batches may be classified in another thread.
+        self.vocabulary = (list(scenes), list(scene_descriptions), self.encode_text(scene_descriptions))
+
+    def set_task_plans(self, task_plans):
+        """
+        Sets the scene vocabulary from task plans; see ``build_scene_vocabulary``.
+
+        :param task_plans: Task plans.
+        :type task_plans: Iterable[dict]
+        """
+        self.set_scenes(*build_scene_vocabulary(task_plans))
+
+    @property
+    def scenes(self):
+        return self.vocabulary[0]
+
+    @property
+    def scene_descriptions(self):
+        return self.vocabulary[1]
 
     @torch.no_grad()
+    def classify_images(self, images: list) -> list:
+        """
+        Classifies a batch of images in a single forward pass.
+
+        :param images: Input images (PIL or numpy arrays).
+        :type images: list[PIL.Image or np.ndarray]
+        :returns: For each image, a list of tuples (scene, probability).
+        :rtype: list[list]
+        """
+        images = [
+            Image.fromarray(image.astype('uint8'), 'RGB') if isinstance(image, np.ndarray) else image
+            for image in images
+        ]
+        if not images:
+            return []
+
+        scenes, _, text_embeds = self.vocabulary
+        image_inputs = self.processor(images=images, return_tensors="pt").to(self.device)
+        image_embeds = self.image_encoder(image_inputs["pixel_values"]).to(self.device)
+        image_embeds = image_embeds / image_embeds.norm(dim=-1, keepdim=True)
+        # Same logits as CLIPModel.forward, without re-encoding the text.
+        logits_per_image = self.model.logit_scale.exp() * image_embeds @ text_embeds.t()
+        probs = logits_per_image.softmax(dim=1).tolist()
+        return [list(zip(scenes, image_probs)) for image_probs in probs]
+
     def classify_image(self, image: Image.Image) -> list:
         """
         Classifies the input image into one of the predefined scenes.
@@ -53,14 +213,34 @@ class MultiSceneClassificationModule:
         :returns: List of tuples (scene, probability).
         :rtype: list
         """
-        if isinstance(image, np.ndarray):
-            image = Image.fromarray(image.astype('uint8'), 'RGB')
+        return self.classify_images([image])[0]
+
+    def is_relevant(self, results: list, threshold: float = 0.3) -> bool:
+        """
+        Whether classification results denote a relevant scene.
+
+        :param results: List of tuples (scene, probability) of one image.
+        :type results: list
+        :param threshold: Probability threshold to consider a scene as relevant.
+        :type threshold: float
+        :returns: True if the top scene is not the unrelated scene and is likely enough.
+        :rtype: bool
+        """
+        top_scene, top_prob = max(results, key=lambda x: x[1])
+        return top_scene != UNRELATED_SCENE and top_prob >= threshold
+
+    def filter_frames(self, frames: list, threshold: float = 0.3) -> list:
+        """
+        Filters a batch of frames in a single forward pass.
 
-        image_inputs = self.processor(images=image, return_tensors="pt").to(self.device)
-        outputs = self.model(**image_inputs, **self.text_inputs)
-        logits_per_image = outputs.logits_per_image
-        probs = logits_per_image.softmax(dim=1)
-        return [(scene, prob.item()) for scene, prob in zip(self.scenes, probs[0])]
+        :param frames: Input frames.
+        :type frames: list[PIL.Image or np.ndarray]
+        :param threshold: Probability threshold to consider a scene as relevant.
+        :type threshold: float
+        :returns: For each frame, True if it is relevant; False if it's unrelated.
+        :rtype: list[bool]
+        """
+        return [self.is_relevant(results, threshold) for results in self.classify_images(frames)]
 
     def filter_frame(self, frame: Image.Image, threshold: float = 0.3) -> bool:
         """
@@ -73,8 +253,4 @@ class MultiSceneClassificationModule:
         :returns: True if the frame is relevant; False if it's unrelated.
         :rtype: bool
         """
-        results = self.classify_image(frame)
-        sorted_results = sorted(results, key=lambda x: x[1], reverse=True)
-        top_scene, top_prob = sorted_results[0]
-        is_relevant = top_scene != "unrelated scene" and top_prob >= threshold
-        return is_relevant
+        return self.filter_frames([frame], threshold)[0]
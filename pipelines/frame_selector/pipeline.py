@@ -10,6 +10,7 @@ Author: VIDA NYU
 
 # === Standard Library ===
 import os
+import asyncio
 import json
 import re
 from functools import reduce
@@ -26,10 +27,15 @@ from torchvision import models, transforms
 
 # === Internal Imports ===
 from ptgctl_pipeline.ptgctl_pipeline.pipeline.base import BasePipeline
-from ptgctl_pipeline.ptgctl_pipeline.codec import HoloframeCodec
+from ptgctl_pipeline.ptgctl_pipeline.codec import HoloframeCodec, JsonCodec
 from ptgctl_pipeline.ptgctl_pipeline.stream import StreamConfig
+from ptgctl_pipeline.ptgctl_pipeline.utils.pyramid import get_frame_image
+from ptgctl_pipeline.ptgctl_pipeline.utils.micro_batcher import MicroBatcher
+from ptgctl_pipeline.ptgctl_pipeline.utils.single_flight import SupersededError
 from pipelines.frame_selector.module import FrameSelectorModule
+from pipelines.task.task_plans import TASK_PLAN_MAP
 from .multi_scene import MultiSceneClassificationModule
+from .prefilter import FramePreFilter
 
 
 class FrameSelectorPipeline(BasePipeline):
@@ -38,26 +44,67 @@ class FrameSelectorPipeline(BasePipeline):
 
     **Streams**:
         - Input: ``main`` (HoloframeCodec) – receives incoming video frames.
+        - Input: ``intent:task_plan`` (JsonCodec) – replaces the active task plan.
         - Trigger: ``main`` (HoloframeCodec) – triggers the filtering process.
         - Output: ``processed_main`` (HoloframeCodec) – publishes selected valid frames.
 
     This pipeline is designed to ignore uninformative frames and reduce processing load.
+    Frames are classified against the scene of the active task plan and a
+    generic unrelated scene.
+
+    A ``FramePreFilter`` runs before classification: blurry frames are
+    rejected, and near-duplicate frames reuse the verdict of the frame they
+    duplicate instead of being classified again.
+
+    Frames triggered while the classifier is busy are classified together in
+    the next batch of up to ``max_batch``; at most ``max_pending`` frames wait
+    and older ones are dropped. Concurrent triggers require a trigger queue
+    with ``max_in_flight`` above 1.
     """
 
     IMAGE_INPUT_STREAM_NAME = "main"
     TRIGGER_STREAM = "main"
     OUTPUT_STREAM = "processed_main"
+    TASK_PLAN_STREAM = "intent:task_plan"
+    # Shortest edge expected by the CLIP processor.
+    CLASSIFIER_RESOLUTION = 224
 
-    def __init__(self, stream_map = {}):
+    def __init__(self, stream_map = {}, task_name="coffee", max_batch=4, max_wait=0.0, max_pending=4,
+                 hash_size=8, change_threshold=4, blur_threshold=60.0,
+                 backend="torch", artifact_dir=None):
         """
         Initializes the FrameSelectorPipeline with stream configurations and
         a scene classification model to filter valid frames.
+
+        :param task_name: Name of the initial task plan in ``TASK_PLAN_MAP``.
+        :type task_name: str
+        :param max_batch: Maximum number of frames classified in one forward pass.
+        :type max_batch: int
+        :param max_wait: Maximum time in seconds a frame arriving at an idle classifier waits for others.
+        :type max_wait: float
+        :param max_pending: Maximum number of frames waiting for the classifier; older ones are dropped.
+        :type max_pending: int
+        :param hash_size: Hash edge of the duplicate check.
+        :type hash_size: int
+        :param change_threshold: Maximum hash distance (bits) of a duplicate frame; None disables the check.
+        :type change_threshold: int or None
+        :param blur_threshold: Minimum Laplacian variance of a usable frame; None disables the check.
+        :type blur_threshold: float or None
+        :param backend: Inference backend of the scene classifier: ``torch``,
+            ``torchscript-int8``, ``onnx`` or ``onnx-int8``.
+        :type backend: str
+        :param artifact_dir: Directory of exported model artifacts.
+        :type artifact_dir: str or None
         """
         
         super().__init__(stream_map=stream_map)
 
-        input_streams = [StreamConfig(self.IMAGE_INPUT_STREAM_NAME, HoloframeCodec)]
-        trigger_streams = [StreamConfig(self.TRIGGER_STREAM, HoloframeCodec)]
+        input_streams = [
+            StreamConfig(self.IMAGE_INPUT_STREAM_NAME, HoloframeCodec, readonly=True, coalesce=True),
+            StreamConfig(self.TASK_PLAN_STREAM, JsonCodec),
+        ]
+        trigger_streams = [StreamConfig(self.TRIGGER_STREAM, HoloframeCodec, readonly=True, coalesce=True,
+                                        resolutions=(self.CLASSIFIER_RESOLUTION,))]
         output_streams = [StreamConfig(self.OUTPUT_STREAM, HoloframeCodec)]
 
         self.add_input_streams(
@@ -70,45 +117,91 @@ class FrameSelectorPipeline(BasePipeline):
             output_streams
         )
 
-        self.frame_selector = MultiSceneClassificationModule()
+        self.task_plan = TASK_PLAN_MAP[task_name]
+        self.frame_selector = MultiSceneClassificationModule(
+            [self.task_plan], backend=backend, artifact_dir=artifact_dir
+        )
+        self.prefilter = FramePreFilter(hash_size, change_threshold, blur_threshold)
+        self.batcher = MicroBatcher(
+            self.frame_selector.filter_frames, max_batch=max_batch, max_wait=max_wait, max_pending=max_pending
+        )
         self.frame = None
         self.valid_frame = None
         self.empty_counter = 0
         self.empty_threshold = 10
+        # (difference hash of the reference frame, classifier verdict)
+        self.last_verdict = (None, False)
 
     async def on_input_stream(self, message, sid):
         """
         Handles new input frames from the input stream.
 
-        :param message: A dictionary containing the frame data (expects a key 'image').
-        :type message: dict
+        The frame is kept undecoded; it is only decoded if it is read later.
+
+        :param message: A lazily decoded frame (exposes a key 'image').
+        :type message: LazyHoloframe
         :param sid: The stream ID from which the message originates.
         :type sid: str
         """
         if sid == self.IMAGE_INPUT_STREAM_NAME:
-            self.frame = message['image']
+            self.frame = message
+        elif sid == self.TASK_PLAN_STREAM and message:
+            await self.set_task_plan(message)
+
+    async def set_task_plan(self, task_plan):
+        """
+        Makes a task plan the active one of the scene classifier.
+
+        Text embeddings are cached per scene description, so only a plan not
+        seen before runs the text tower (in a worker thread).
+
+        :param task_plan: Task plan with ``desired_task`` and ``objects``.
+        :type task_plan: dict
+        """
+        if not task_plan.get("desired_task"):
+            return
+        self.task_plan = task_plan
+        await asyncio.to_thread(self.frame_selector.set_task_plans, [task_plan])
 
     async def on_trigger_stream(self, message):
         """
         Applies the frame filtering logic when triggered.
 
-        If the frame passes the scene classifier, it is returned as valid output.
-        Otherwise, the function increments an internal counter and returns None.
+        If the frame is sharp and the scene classifier accepts it, it is returned as valid output.
+        A near-duplicate of the last classified frame gets that frame's verdict, unless the
+        verdict is still pending. Otherwise, the function increments an internal counter and
+        returns None.
 
         :param message: A dictionary containing the trigger frame (expects a key 'image').
         :type message: dict
         :returns: A valid frame if accepted by the filter, otherwise None.
         :rtype: np.ndarray or None
         """
-        frame_rgb = cv2.cvtColor(message['image'], cv2.COLOR_BGR2RGB)
-
         if self.empty_counter > self.empty_threshold:
             self.empty_counter = 0
             return message['image']
 
-        pil_frame = Image.fromarray(frame_rgb) if isinstance(frame_rgb, np.ndarray) else None
+        frame_rgb = get_frame_image(message, self.CLASSIFIER_RESOLUTION, rgb=True)
 
-        if pil_frame and self.frame_selector.filter_frame(pil_frame):
+        if not isinstance(frame_rgb, np.ndarray):
+            self.empty_counter += 1
+            return None
+        rejection = self.prefilter.check(frame_rgb)
+        if rejection == FramePreFilter.BLURRY:
+            self.empty_counter += 1
+            return None
+
+        reference = self.prefilter.last_hash
+        if rejection == FramePreFilter.DUPLICATE and self.last_verdict[0] == reference:
+            valid = self.last_verdict[1]
+        else:
+            try:
+                valid = await self.batcher.submit(Image.fromarray(frame_rgb))
+            except SupersededError:
+                # Dropped for newer frames while the classifier was busy.
+                return None
+            self.last_verdict = (reference, valid)
+        if valid:
             self.valid_frame = message['image']
             return self.valid_frame
         else:
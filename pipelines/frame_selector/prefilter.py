@@ -0,0 +1,96 @@
+"""
+Frame Pre-Filter
+
+Cheap checks run before scene classification, so that motion-blurred frames
+never reach the model and near-duplicate frames can reuse an earlier verdict.
+"""
+
+# === Third-party Libraries ===
+import cv2
+import numpy as np
+
+
+def difference_hash(gray: np.ndarray, hash_size: int = 8) -> int:
+    """
+    Computes the difference hash (dHash) of a grayscale image.
+
+    The image is shrunk to ``(hash_size + 1) x hash_size`` pixels and each bit
+    records whether a pixel is brighter than its right neighbour, so the
+    hash is robust to scaling, compression and small exposure changes.
+
+    :param gray: Grayscale image.
+    :type gray: np.ndarray
+    :param hash_size: Hash edge; the hash has ``hash_size ** 2`` bits.
+    :type hash_size: int
+    :returns: The hash as an integer.
+    :rtype: int
+    """
+    small = cv2.resize(gray, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def blur_score(gray: np.ndarray) -> float:
+    """
+    Measures sharpness as the variance of the Laplacian.
+
+    :param gray: Grayscale image.
+    :type gray: np.ndarray
+    :returns: Variance of the Laplacian; low values mean a blurry image.
+    :rtype: float
+    """
+    return float(cv2.Laplacian(gray, cv2.CV_64F).var())
+
+
+class FramePreFilter:
+    """
+    Flags frames that are redundant or unusable before model inference.
+
+    A frame is flagged as a duplicate when the Hamming distance between its
+    difference hash and that of the last accepted frame (``last_hash``) is at
+    most ``change_threshold`` bits; it shows the same scene, so the caller
+    can reuse that frame's verdict. It is flagged as blurry when its
+    Laplacian variance is below ``blur_threshold``. Scores depend on the image resolution, so
+    frames should always be checked at the same resolution.
+
+    :param hash_size: Hash edge of the difference hash.
+    :type hash_size: int
+    :param change_threshold: Maximum Hamming distance of a duplicate; None disables the check.
+    :type change_threshold: int or None
+    :param blur_threshold: Minimum Laplacian variance of a usable frame; None disables the check.
+    :type blur_threshold: float or None
+    """
+
+    DUPLICATE = "duplicate"
+    BLURRY = "blurry"
+
+    def __init__(self, hash_size: int = 8, change_threshold: int = 4, blur_threshold: float = 60.0):
+        self.hash_size = hash_size
+        self.change_threshold = change_threshold
+        self.blur_threshold = blur_threshold
+        self.last_hash = None
+        self.skipped = {self.DUPLICATE: 0, self.BLURRY: 0}
+
+    def check(self, frame: np.ndarray):
+        """
+        Checks a frame and remembers it as the reference if accepted.
+
+        :param frame: RGB or grayscale frame.
+        :type frame: np.ndarray
+        :returns: None if the frame should be classified, otherwise the
+            rejection reason (``duplicate`` or ``blurry``).
+        :rtype: str or None
+        """
+        gray = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY) if frame.ndim == 3 else frame
+
+        if self.blur_threshold is not None and blur_score(gray) < self.blur_threshold:
+            self.skipped[self.BLURRY] += 1
+            return self.BLURRY
+
+        if self.change_threshold is not None:
+            frame_hash = difference_hash(gray, self.hash_size)
+            if self.last_hash is not None and bin(frame_hash ^ self.last_hash).count("1") <= self.change_threshold:
+                self.skipped[self.DUPLICATE] += 1
+                return self.DUPLICATE
+            self.last_hash = frame_hash
+        return None
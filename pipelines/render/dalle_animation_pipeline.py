@@ -5,14 +5,12 @@ Generates a multi-step instructional animation from a semicolon-separated prompt
 """
 
 import asyncio
-import aiohttp
 import os
-import httpx
 
 from ptgctl_pipeline.ptgctl_pipeline.pipeline.base import BasePipeline
 from ptgctl_pipeline.ptgctl_pipeline.stream import StreamConfig
 from ptgctl_pipeline.ptgctl_pipeline.codec import JsonCodec, BytesCodec
-from ptgctl_pipeline.ptgctl_pipeline.pipeline.examples.gpt4v_pipeline import assemble_headers
+from ptgctl_pipeline.ptgctl_pipeline.llm import get_llm_client, openai_image_generation
 from .image_sequence_pb2 import ImageSequence
 
 
@@ -147,19 +145,16 @@ class DallePipelineAnim(BasePipeline):
         :rtype: str or None
         """
         try:
-            headers = assemble_headers(self.api_key)
-            timeout = httpx.Timeout(60.0, connect=30.0)
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                payload = {
-                    "model": gpt_model,
-                    "prompt": prompt,
-                    "size": "1024x1024",
-                    "quality": "standard",
-                    "n": 1,
-                    "response_format": "url"
-                }
-                response = await client.post("https://api.openai.com/v1/images/generations", headers=headers, json=payload)
-                return response.json()['data'][0]['url']
+            payload = {
+                "model": gpt_model,
+                "prompt": prompt,
+                "size": "1024x1024",
+                "quality": "standard",
+                "n": 1,
+                "response_format": "url"
+            }
+            response = await openai_image_generation(payload, self.api_key)
+            return response['data'][0]['url']
         except Exception as e:
             logger.error(f"Failed to fetch animation step: {e}")
             return None
@@ -184,6 +179,4 @@ async def download_image_async(url):
     :return: Image content in bytes.
     :rtype: bytes
     """
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url) as response:
-            return await response.read()
+    return await get_llm_client().download(url)
@@ -4,14 +4,12 @@ Dalle Image Pipeline
 Generates a single instructional-style image using OpenAI's DALL-E based on a natural language prompt.
 """
 import os
-import requests
-import httpx
 from PIL import Image
 
 from ptgctl_pipeline.ptgctl_pipeline.pipeline.base import BasePipeline
 from ptgctl_pipeline.ptgctl_pipeline.stream import StreamConfig
 from ptgctl_pipeline.ptgctl_pipeline.codec import JsonCodec, BytesCodec
-from ptgctl_pipeline.ptgctl_pipeline.pipeline.examples.gpt4v_pipeline import assemble_headers
+from ptgctl_pipeline.ptgctl_pipeline.llm import get_llm_client, openai_image_generation
 from .image_sequence_pb2 import ImageSequence
 
 
@@ -121,7 +119,7 @@ class DallePipeline(BasePipeline):
         if not flag:
             return self.load_default_image()
 
-        image_data = self.download_image(image_url)
+        image_data = await self.download_image(image_url)
         with open(f"dalle_figs/dalle_image{self.index}.png", "wb") as f:
             f.write(image_data)
 
@@ -137,7 +135,7 @@ class DallePipeline(BasePipeline):
         with open("static/loading.png", "rb") as f:
             return f.read()
 
-    def download_image(self, url):
+    async def download_image(self, url):
         """
         Download an image from the provided URL.
 
@@ -146,7 +144,7 @@ class DallePipeline(BasePipeline):
         :return: Image content.
         :rtype: bytes
         """
-        return requests.get(url).content
+        return await get_llm_client().download(url)
 
     async def fetch_gpt_response(self, prompt, gpt_model="dall-e-3"):
         """
@@ -160,20 +158,17 @@ class DallePipeline(BasePipeline):
         :rtype: tuple[bool, str or None]
         """
         try:
-            headers = assemble_headers()
-            timeout = httpx.Timeout(60.0, connect=30.0)
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                payload = {
-                    "model": gpt_model,
-                    "prompt": prompt,
-                    "size": "1024x1024",
-                    "quality": "standard",
-                    "n": 1,
-                    "response_format": "url"
-                }
-                response = await client.post("https://api.openai.com/v1/images/generations", headers=headers, json=payload)
-                image_url = response.json()['data'][0]['url']
-                return True, image_url
+            payload = {
+                "model": gpt_model,
+                "prompt": prompt,
+                "size": "1024x1024",
+                "quality": "standard",
+                "n": 1,
+                "response_format": "url"
+            }
+            response = await openai_image_generation(payload, self.api_key)
+            image_url = response['data'][0]['url']
+            return True, image_url
         except Exception as e:
             logger.error(f"Failed to fetch image: {e}")
             return False, None
@@ -56,20 +56,18 @@ class FuzzyTaskMachine:
     def add_frame(self, frame_data):
         """
         Add a frame's data to the buffer for all checkpoints in the current step.
-        frame_data format: {
-            "checkpoint_predictions": [True, False, ...],  # Predictions for each checkpoint
-            "in_step": number  # Index for the step
-        }
+        frame_data is a ``StepCheckpointPrediction``: one ``FuzzyValue``
+        (value, confidence) per checkpoint, and one for ``in_step``.
         """
         # Ensure the frame is for the current step
         # if frame_data["in_step"] == self.current_step_state.value:
             # Add frame data to each checkpoint buffer
-        for idx, prediction in enumerate(frame_data['checkpoint_predictions']):
+        for idx, prediction in enumerate(frame_data.checkpoint_predictions):
             if idx in self.checkpoint_buffers:
-                self.checkpoint_buffers[idx].append({'checkpoint_reached': prediction['value'] * prediction['confidence']})
+                self.checkpoint_buffers[idx].append({'checkpoint_reached': prediction.value * prediction.confidence})
                 
-        in_step_pred = frame_data.get('in_step', {"value": 0, "confidence": 0})
-        self.in_step_buffer.append(in_step_pred['value'] * in_step_pred['confidence'])
+        in_step_pred = frame_data.in_step
+        self.in_step_buffer.append(in_step_pred.value * in_step_pred.confidence)
         
     def calculate_checkpoint_confidence(self, checkpoint_index):
         """
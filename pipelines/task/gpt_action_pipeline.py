@@ -12,6 +12,7 @@ from ptgctl_pipeline.ptgctl_pipeline.stream import StreamConfig
 from ptgctl_pipeline.ptgctl_pipeline.codec import JsonCodec, HoloframeCodec
 from pathlib import Path
 import yaml
+from .helper.tag_parser import strip_code_fence
 
 # Load prompt from YAML
 PROMPT_PATH = Path(__file__).parent / "prompts/action.yaml"
@@ -44,6 +45,7 @@ class GPTActionPredictionPipeline(GPT4VPipeline):
     INPUT_IMAGE_STREAM_NAME = "main"
     TRIGGER_STREAM_NAME = "intent:trigger:action"
     OUTPUT_STREAM_NAME = "intent:pred:step:checkpoints"
+    CONCAT_RESIZE_RATIO = 0.6
 
     def __init__(self,
             api_key: str = "",
@@ -110,7 +112,7 @@ class GPTActionPredictionPipeline(GPT4VPipeline):
         :param message: Unused trigger message.
         :return: Dictionary of predictions or None.
         """
-        flag, concat_image = await self.get_concat_image(resize_ratio=0.6)
+        flag, concat_image = await self.get_concat_image()
         cv2.imwrite("concat_image.jpg", concat_image)
 
         if flag and self.current_step is not None:
@@ -158,9 +160,7 @@ def parse_result(result_string):
     :return: Parsed dictionary or None on failure.
     """
     try:
-        result_string = result_string.strip()
-        if result_string.startswith("```json"):
-            result_string = result_string[7:-3]
+        result_string = strip_code_fence(result_string)
         result = json.loads(result_string)
         return {
             "checkpoints": [c['status'] for c in result['checkpoints']],
@@ -16,6 +16,7 @@ from ptgctl_pipeline.ptgctl_pipeline.pipeline.base import BasePipeline
 from ptgctl_pipeline.ptgctl_pipeline.codec import JsonCodec, HoloframeCodec, BytesCodec, StringCodec
 from ptgctl_pipeline.ptgctl_pipeline.stream import StreamConfig
 from ptgctl_pipeline.ptgctl_pipeline.pipeline.examples import GPT4VPipeline, FramePipeline
+from ptgctl_pipeline.ptgctl_pipeline.utils import SupersededError
 import cv2
 import numpy as np
 from functools import reduce
@@ -33,6 +34,8 @@ import re
 import json
 import yaml
 from pipelines.frame_selector import FrameSelectorModule 
+from pipelines.task.helper.tag_parser import IncrementalTagParser, parse_tags
+from pipelines.task.task_plans import TASK_PLAN_MAP
 from PIL import Image
 from pathlib import Path
 
@@ -51,6 +54,7 @@ class GPTGuidancePipeline(GPT4VPipeline):
     - `intent:belief` (user/system belief)
     - `intent:task:step:next` (next task step)
     - `intent:expertise` (user expertise level)
+    - `intent:task_plan` (active task plan)
 
     Triggered by:
     - `intent:trigger:guidance`
@@ -62,12 +66,33 @@ class GPTGuidancePipeline(GPT4VPipeline):
     TRIGGER_STREAM = "intent:trigger:guidance"
     OUTPUT_STREAM = "intent:pred:guidance"
     TASK_DESCRIPTION = ""
+    OUTPUT_SCHEMA = "You should always output <INTENT><DESIRE><META_INTENT><GUIDANCE_TYPE><CONFIRMATION_CONTENT><OBJECT_LIST><TEXT_GUIDANCE_TITLE><TEXT_GUIDANCE_CONTENT><GUIDANCE_FLAG><DALLE_PROMPT><HIGHLIGHT_OBJECT_FLAG><HIGHLIGHT_OBJECT_LOC><HIGHLIGHT_OBJECT_LABEL> in the response. If you can't recognize INTENT due to blur image or vague actions, infer the <INTENT> as the action the <NEXT_STEP> and provide assistance as usual."
+    CONCAT_RESIZE_RATIO = 0.15
+    # In streaming mode, partial guidance is emitted whenever one of these
+    # tags completes, once all the required ones are known.
+    PARTIAL_GUIDANCE_TAGS = ("GUIDANCE_TYPE", "TEXT_GUIDANCE_TITLE", "TEXT_GUIDANCE_CONTENT")
+    REQUIRED_PARTIAL_TAGS = ("GUIDANCE_TYPE", "TEXT_GUIDANCE_TITLE")
+    # Response tags copied verbatim into the guidance message.
+    TEXT_FIELDS = {
+        "INTENT": "intent",
+        "DESIRE_CONFIRMATION": "desire_confirmation",
+        "DESIRE": "desire",
+        "META_INTENT": "meta_intent",
+        "CONFIRMATION_CONTENT": "confirmation_content",
+        "LOD": "lod",
+        "TEXT_GUIDANCE_TITLE": "text_guidance_title",
+        "TEXT_GUIDANCE_CONTENT": "text_guidance_content",
+        "DALLE_PROMPT": "prompt",
+        "HIGHLIGHT_OBJECT_LABEL": "highlight_object_label",
+    }
     def __init__(self, 
         system_prompt: str = PROMPT_CONFIG['system_prompt'],
         api_key:str = "",
         model="gpt-4",
         image_resolution=512,
         downsample_rate=3,
+        streaming=False,
+        task_name=None,
         stream_map = {},
         ):
         """
@@ -79,6 +104,10 @@ class GPTGuidancePipeline(GPT4VPipeline):
             model (str): Model identifier (default: "gpt-4").
             image_resolution (int): Resolution used for image resizing.
             downsample_rate (int): Downsampling factor for video frames.
+            streaming (bool): Stream the model response and emit partial guidance
+                as soon as its key tags are complete.
+            task_name (str): Name of the initial task plan in ``TASK_PLAN_MAP``
+                (e.g., 'coffee'); replaced by plans received on 'intent:task_plan'.
             stream_map (dict): Optional mapping for stream name overrides.
 
         Streams:
@@ -87,6 +116,7 @@ class GPTGuidancePipeline(GPT4VPipeline):
                 - 'intent:belief' (user/system belief; expects HoloframeCodec)
                 - 'intent:task:step:next' (next task step; expects JsonCodec)
                 - 'intent:expertise' (user's expertise level; expects JsonCodec)
+                - 'intent:task_plan' (active task plan; expects JsonCodec)
 
             Trigger:
                 - 'intent:trigger:guidance'
@@ -104,6 +134,9 @@ class GPTGuidancePipeline(GPT4VPipeline):
         self.add_input_stream(
             StreamConfig("intent:expertise", JsonCodec)
         )
+        self.add_input_stream(
+            StreamConfig("intent:task_plan", JsonCodec)
+        )
 
         self.add_trigger_stream(
             GPTGuidancePipeline.TRIGGER_STREAM
@@ -132,6 +165,11 @@ class GPTGuidancePipeline(GPT4VPipeline):
         self.dropout = 1
 
         self.system_prompt = system_prompt
+        self.task_plan = None
+        self.task_description = GPTGuidancePipeline.TASK_DESCRIPTION
+        if task_name:
+            self.set_task_plan(TASK_PLAN_MAP[task_name])
+        self.streaming = streaming
         self.next_step = None
         self.initialized = False
 
@@ -143,7 +181,7 @@ class GPTGuidancePipeline(GPT4VPipeline):
             message (dict): Incoming message payload.
             sid (str): Stream identifier.
         """
-        if self.busy:
+        if not self.is_accepting_input():
             return 
         if sid == "intent:belief" and message != None:
             self.user_belief = message['belief']['objects']
@@ -152,6 +190,8 @@ class GPTGuidancePipeline(GPT4VPipeline):
             self.frontend_force_active = message['status']
         elif sid == "intent:expertise" and message != None:
             self.expertise = message['expertise']
+        elif sid == "intent:task_plan" and message:
+            self.set_task_plan(message)
         elif sid == "intent:task:step:next" and message != None:
             self.next_step = message
             self.initialized = True
@@ -186,23 +226,16 @@ class GPTGuidancePipeline(GPT4VPipeline):
         # logger.info(f"Start generating guidance {self.guidance_index}")
         
         dialogue_xml = self.assemble_dialogue_xml()
-        self.prompt_message = "<EXPERTISE>" + self.expertise +"</EXPERTISE>"
-        self.prompt_message += "<TASK_DESCRIPTION>" + GPTGuidancePipeline.TASK_DESCRIPTION + "</TASK_DESCRIPTION>"
-        next_step_text = ". ".join(list(map(lambda x: x['instruction'], self.next_step['checkpoints'])))
-        next_step_text = self.next_step['content']
-        self.prompt_message += "<NEXT_STEP>" + next_step_text + "</NEXT_STEP>"
-        # logger.info(f"next step in Prompt message: {next_step_text}")
-        self.prompt_message += "You should always output <INTENT><DESIRE><META_INTENT><GUIDANCE_TYPE><CONFIRMATION_CONTENT><OBJECT_LIST><TEXT_GUIDANCE_TITLE><TEXT_GUIDANCE_CONTENT><GUIDANCE_FLAG><DALLE_PROMPT><HIGHLIGHT_OBJECT_FLAG><HIGHLIGHT_OBJECT_LOC><HIGHLIGHT_OBJECT_LABEL> in the response. If you can't recognize INTENT due to blur image or vague actions, infer the <INTENT> as the action the <NEXT_STEP> and provide assistance as usual."
+        self.prompt_message = self.get_prompt_message()
         self.enabled = True
         
         flag, concat_image = await self.get_concat_image()
         if flag:
-        
-            concat_image = concat_image
-            
-            resized_concat_image = cv2.resize(concat_image, (0, 0), fx=0.5, fy=0.5)
-            # cv2.imwrite(f"figs/slow{self.guidance_index}.jpg", self.concat_image)
-            origin_response = await self.fetch_gpt_response_async(resized_concat_image)
+            # cv2.imwrite(f"figs/slow{self.guidance_index}.jpg", concat_image)
+            if self.streaming:
+                origin_response = await self.stream_guidance(concat_image)
+            else:
+                origin_response = await self.fetch_gpt_response_async(concat_image)
             self.enabled = False
             if self.postprocess and 'result' in origin_response:
                 # logger.info(f"Origin Response: {origin_response}")
@@ -210,10 +243,13 @@ class GPTGuidancePipeline(GPT4VPipeline):
                 # logger.info(f"Response: {response}")
             else:
                 self.debug("origin:", origin_response)
+                if not origin_response.get("superseded"):
+                    # Otherwise the newer request that replaced this one is still running.
+                    self.busy = False
                 return None
             time_duration = time.time() - start_time
             if response['guidance_flag'] == True:
-                cv2.imwrite(f"figs/assistance.jpg", self.concat_image)
+                cv2.imwrite(f"figs/assistance.jpg", concat_image)
             self.busy = False
             if response['confirmation_content'] == '':
                 self.debug("ERROR: Empty content", origin_response)
@@ -221,20 +257,129 @@ class GPTGuidancePipeline(GPT4VPipeline):
         else:
             self.busy = False
 
+    async def stream_guidance(self, image):
+        """
+        Stream the guidance response, emitting partial guidance on the way.
+
+        Args:
+            image (np.ndarray): Concatenated input image.
+
+        Returns:
+            dict: Same structure as ``fetch_gpt_response_async``.
+        """
+        prompt = self.get_prompt_message()
+        system, _ = self.resolve_system_prompt()
+        cached, cache_entry = self.get_cached_response(image, system, prompt)
+        if cached is not None:
+            return dict(cached, cached=True)
+
+        async def consume():
+            parser = IncrementalTagParser()
+            async for delta in self.stream_gpt_response(image, prompt_message=prompt):
+                for tag, _ in parser.feed(delta):
+                    if tag in self.PARTIAL_GUIDANCE_TAGS and parser.has_all(self.REQUIRED_PARTIAL_TAGS):
+                        await self.emit(GPTGuidancePipeline.OUTPUT_STREAM, self.build_partial_guidance(parser))
+            return parser.text
+
+        try:
+            response = await self.run_request(self.get_request_key(image.tobytes(), system, prompt), consume)
+            result, thoughts = self.parse_result(response)
+            response = {"success": True, "response": response, "thoughts": thoughts, "result": result}
+        except SupersededError:
+            return {"success": False, "superseded": True, "response": "superseded by a newer request"}
+        except Exception as e:
+            return {"success": False, "response": str(e)}
+        self.cache_response(cache_entry, response)
+        return response
+
+    def build_partial_guidance(self, parser):
+        """
+        Build a partial guidance message from the tags parsed so far.
+
+        Args:
+            parser (IncrementalTagParser): Parser of the streamed response.
+
+        Returns:
+            dict: Guidance message flagged with ``partial: True``.
+        """
+        return {
+            "partial": True,
+            "index": int(time.time()),
+            "guidance_type": self.normalize_guidance_type(parser.get("GUIDANCE_TYPE", "")),
+            "text_guidance_title": parser.get("TEXT_GUIDANCE_TITLE", ""),
+            "text_guidance_content": parser.get("TEXT_GUIDANCE_CONTENT", ""),
+            "type": "slow",
+            "active": self.active,
+            "text_always": True,
+            "input_action": self.next_step,
+        }
+
+    @staticmethod
+    def normalize_guidance_type(guidance_type):
+        """Map free-form guidance types onto the types the headset renders."""
+        guidance_type = guidance_type.strip().lower()
+        if guidance_type == "text":
+            guidance_type = "notes"
+        if 'image' in guidance_type:
+            guidance_type = "image"
+        if 'timer' in guidance_type:
+            guidance_type = "timer"
+        return guidance_type
+
+    def set_task_plan(self, task_plan):
+        """
+        Set the active task plan, which the task description is built from.
+
+        Args:
+            task_plan (dict): Task plan with ``desired_task`` and ``steps``.
+        """
+        self.task_plan = task_plan
+        self.task_description = self.describe_task_plan(task_plan)
+
+    @staticmethod
+    def describe_task_plan(task_plan):
+        """Render a task plan as the task description of the prompt."""
+        lines = ["Task: " + task_plan.get('desired_task', "")]
+        for index, step in enumerate(task_plan.get('steps', []), 1):
+            lines.append(f"Step {index}: {step['content']}")
+        if task_plan.get('objects'):
+            lines.append("Objects: " + ", ".join(task_plan['objects']))
+        return "\n".join(lines)
+
+    def get_static_prompt(self):
+        """
+        Static part of the guidance prompt: task description and output schema.
+
+        It only changes with the task, so it is part of the cached prefix.
+        """
+        prompt = "\n<TASK_DESCRIPTION>" + self.task_description + "</TASK_DESCRIPTION>\n"
+        prompt += GPTGuidancePipeline.OUTPUT_SCHEMA
+        return prompt
+
+    def get_prompt_prefix_key(self):
+        # The description is derived from the active plan, so a new plan yields a new prefix.
+        return self.task_description
+
+    def get_response_cache_scope(self):
+        return self.next_step['content'] if self.next_step else None
+
     def get_prompt_message(self):
+        """
+        Dynamic part of the guidance prompt: user expertise and next step.
+        """
         prompt_message = "<EXPERTISE>" + self.expertise +"</EXPERTISE>"
-        prompt_message += "<TASK_DESCRIPTION>" + GPTGuidancePipeline.TASK_DESCRIPTION + "</TASK_DESCRIPTION>"
-        next_step_text = ". ".join(list(map(lambda x: x['instruction'], self.next_step['checkpoints'])))
         next_step_text = self.next_step['content']
         prompt_message += "<NEXT_STEP>" + next_step_text + "</NEXT_STEP>"
         # logger.info(f"next step in Prompt message: {next_step_text}")
-        prompt_message += "You should always output <INTENT><DESIRE><META_INTENT><GUIDANCE_TYPE><CONFIRMATION_CONTENT><OBJECT_LIST><TEXT_GUIDANCE_TITLE><TEXT_GUIDANCE_CONTENT><GUIDANCE_FLAG><DALLE_PROMPT><HIGHLIGHT_OBJECT_FLAG><HIGHLIGHT_OBJECT_LOC><HIGHLIGHT_OBJECT_LABEL> in the response. If you can't recognize INTENT due to blur image or vague actions, infer the <INTENT> as the action the <NEXT_STEP> and provide assistance as usual."
         return prompt_message
     
     def postprocess(self, response):
         """
         Extract and structure guidance information from GPT output lines.
 
+        All tagged fields are read in a single scan, so values may span lines
+        and a line may hold several fields.
+
         Args:
             result (list of str): Lines of GPT-4V response.
 
@@ -258,68 +403,32 @@ class GPTGuidancePipeline(GPT4VPipeline):
         response['highlight_object_loc'] = "none"
         response['highlight_object_label'] = "N/A"
 
-       
-        
-        thoughts = []
-        chat_message_bool = False
-        guidance_flag = False
-        for line in line_list:
-            if "<INTENT>" in line:
-                response['intent'] = line.split("<INTENT>")[1].split("</INTENT>")[0].strip()
-            elif "<DESIRE_CONFIRMATION>" in line:
-                response['desire_confirmation'] = line.split("<DESIRE_CONFIRMATION>")[1].split("</DESIRE_CONFIRMATION>")[0].strip()
-            elif "<DESIRE>" in line:
-                response['desire'] = line.split("<DESIRE>")[1].split("</DESIRE>")[0].strip()
-            elif "<META_INTENT>" in line:
-                response['meta_intent'] = line.split("<META_INTENT>")[1].split("</META_INTENT>")[0].strip()
-            elif "<GUIDANCE_TYPE>" in line or "<Guidance_TYPE>" in line or "<guidance_type>" in line:
-                response['guidance_type'] = line.split("<GUIDANCE_TYPE>")[1].split("</GUIDANCE_TYPE>")[0].strip().lower()
-                if response['guidance_type'] == "text":
-                    response['guidance_type'] = "notes"
-                if 'image' in response['guidance_type']:
-                    response['guidance_type'] = "image"
-                if 'timer' in response['guidance_type']:
-                    response['guidance_type'] = "timer"
-            elif "<CONFIRMATION_CONTENT>" in line:
-                response['confirmation_content'] = line.split("<CONFIRMATION_CONTENT>")[1].split("</CONFIRMATION_CONTENT>")[0].strip()
-            elif "<LOD>" in line:
-                response['lod'] = line.split("<LOD>")[1].split("</LOD>")[0].strip()
-            elif "<TEXT_GUIDANCE_TITLE>" in line:
-                response['text_guidance_title'] = "Guidance"
-                response['text_guidance_title'] = line.split("<TEXT_GUIDANCE_TITLE>")[1].split("</TEXT_GUIDANCE_TITLE>")[0].strip()
-            elif "<TEXT_GUIDANCE_CONTENT>" in line:
-                response['text_guidance_content'] = line.split("<TEXT_GUIDANCE_CONTENT>")[1].split("</TEXT_GUIDANCE_CONTENT>")[0].strip()
-            elif "<GUIDANCE_FLAG>" in line:
-                text_guidance_flag = line.split("<GUIDANCE_FLAG>")[1].split("</GUIDANCE_FLAG>")[0].strip()
-                guidance_flag = True if text_guidance_flag.strip().lower() == "true" else False
-                response['guidance_flag'] = guidance_flag
-            elif "<DALLE_PROMPT>" in line:
-                response['prompt'] = line.split("<DALLE_PROMPT>")[1].split("</DALLE_PROMPT>")[0].strip()
-            elif "<CHAT_MESSAGE_FLAG>" in line:
-                chat_message_flag = line.split("<CHAT_MESSAGE_FLAG>")[1].split("</CHAT_MESSAGE_FLAG>")[0].strip()
-                chat_message_bool = True if chat_message_flag.strip().lower() == "true" else False
-                response['chat_flag'] = chat_message_flag
-            elif "<CHAT_MESSAGE>" in line:
-                response['chat_message'] = line.split("<CHAT_MESSAGE>")[1].split("</CHAT_MESSAGE>")[0].strip()
-                if chat_message_bool:
-                    self.dialogue.append(
-                        {
-                            "sender": "assistant",
-                            "content": response['chat_message'],
-                            "timestamp": int(time.time())
-                        }
-                    )
-            elif "<HIGHLIGHT_OBJECT_FLAG>" in line:
-                highlight_object_flag = line.split("<HIGHLIGHT_OBJECT_FLAG>")[1].split("</HIGHLIGHT_OBJECT_FLAG>")[0].strip()
-                highlight_object_bool = True if highlight_object_flag.strip().lower() == "true" else False
-                response['highlight_object_flag'] = highlight_object_bool
-            elif "<HIGHLIGHT_OBJECT_LOC>" in line:
-                response['highlight_object_loc'] = line.split("<HIGHLIGHT_OBJECT_LOC>")[1].split("</HIGHLIGHT_OBJECT_LOC>")[0].strip().lower()
-            elif "<HIGHLIGHT_OBJECT_LABEL>" in line:
-                response['highlight_object_label'] = line.split("<HIGHLIGHT_OBJECT_LABEL>")[1].split("</HIGHLIGHT_OBJECT_LABEL>")[0].strip()
-            else:
-                thoughts.append(line)
+        fields = parse_tags("\n".join(line_list))
+        for tag, key in GPTGuidancePipeline.TEXT_FIELDS.items():
+            if tag in fields:
+                response[key] = fields[tag]
+        if "GUIDANCE_TYPE" in fields:
+            response['guidance_type'] = self.normalize_guidance_type(fields["GUIDANCE_TYPE"])
+        if "HIGHLIGHT_OBJECT_LOC" in fields:
+            response['highlight_object_loc'] = fields["HIGHLIGHT_OBJECT_LOC"].lower()
+        if "HIGHLIGHT_OBJECT_FLAG" in fields:
+            response['highlight_object_flag'] = fields["HIGHLIGHT_OBJECT_FLAG"].lower() == "true"
+        if "GUIDANCE_FLAG" in fields:
+            response['guidance_flag'] = fields["GUIDANCE_FLAG"].lower() == "true"
+        if "CHAT_MESSAGE_FLAG" in fields:
+            response['chat_flag'] = fields["CHAT_MESSAGE_FLAG"]
+        if "CHAT_MESSAGE" in fields:
+            response['chat_message'] = fields["CHAT_MESSAGE"]
+            if fields.get("CHAT_MESSAGE_FLAG", "").lower() == "true":
+                self.dialogue.append(
+                    {
+                        "sender": "assistant",
+                        "content": response['chat_message'],
+                        "timestamp": int(time.time())
+                    }
+                )
         response["index"] = int(time.time())
+        response['partial'] = False
         response['desire'] = "Connect Switch"
         # response['desire'] = 'Arrange Flowers'
         # response['desire'] = 'Make Coffee'
@@ -0,0 +1,129 @@
+"""
+Tag Parser
+
+Single-pass extraction of ``<TAG>value</TAG>`` fields from LLM output, both
+for complete responses and for responses streamed in chunks.
+"""
+
+import re
+
+
+# A value never contains another opening tag of the same name, so a schema
+# echo such as "<INTENT><DESIRE> ..." does not swallow the real field.
+TAG_PATTERN = re.compile(r"<([A-Za-z_]+)>((?:(?!<\1>).)*?)</\1>", re.DOTALL | re.IGNORECASE)
+
+# A closed field, or an unclosed one whose value runs to the end of the line.
+FIELD_PATTERN = re.compile(r"<([A-Za-z_]+)>(?:((?:(?!<\1>).)*?)</\1>|([^\n]*))", re.DOTALL | re.IGNORECASE)
+
+CODE_FENCE_PATTERN = re.compile(r"^\s*(?:```[A-Za-z]*|xml|json)\s*(.*?)\s*(?:```)?\s*$", re.DOTALL)
+
+
+def iter_tags(text, tags=None):
+    """
+    Yield the tagged fields of a complete response in a single scan.
+
+    Values may span several lines and a line may hold several fields. A tag
+    without a closing tag takes the rest of its line, as models sometimes
+    drop the closing tag on the last field.
+
+    :param text: Full response text.
+    :type text: str
+    :param tags: Optional tag names to keep; all tags are kept if None.
+    :type tags: Iterable[str] or None
+    :returns: ``(tag, value)`` pairs in order of appearance, with upper-case tags.
+    :rtype: Iterator[tuple[str, str]]
+    """
+    tags = {tag.upper() for tag in tags} if tags is not None else None
+    for match in FIELD_PATTERN.finditer(text):
+        tag = match.group(1).upper()
+        if tags is not None and tag not in tags:
+            continue
+        value = match.group(2) if match.group(2) is not None else match.group(3)
+        yield tag, value.strip()
+
+
+def parse_tags(text, tags=None):
+    """
+    Parse the tagged fields of a complete response into a dict.
+
+    When a tag appears more than once, the last value wins.
+
+    :param text: Full response text.
+    :type text: str
+    :param tags: Optional tag names to keep; all tags are kept if None.
+    :type tags: Iterable[str] or None
+    :returns: Values by upper-case tag name.
+    :rtype: dict[str, str]
+    """
+    return dict(iter_tags(text, tags))
+
+
+def strip_code_fence(text):
+    """
+    Remove a Markdown code fence (e.g. ````` ```json `````) or a bare ``xml`` /
+    ``json`` language prefix around a structured response.
+
+    :param text: Raw response text.
+    :type text: str
+    :returns: The enclosed payload.
+    :rtype: str
+    """
+    match = CODE_FENCE_PATTERN.match(text)
+    return match.group(1) if match else text.strip()
+
+
+class IncrementalTagParser:
+    """
+    Extracts tagged fields from text that arrives in chunks.
+
+    Chunks are appended to a buffer and only the unparsed tail is scanned, so
+    each character is examined a bounded number of times regardless of how
+    the text is split. Tag names are normalized to upper case, since models
+    occasionally vary the casing (e.g. ``<Guidance_TYPE>``).
+
+    :param tags: Optional tag names to keep; all tags are kept if None.
+    :type tags: Iterable[str] or None
+    """
+
+    def __init__(self, tags=None):
+        self.tags = {tag.upper() for tag in tags} if tags is not None else None
+        self.buffer = ""
+        self.pos = 0
+        self.values = {}
+
+    def feed(self, text):
+        """
+        Append a chunk and return the fields completed by it.
+
+        :param text: Next chunk of the response.
+        :type text: str
+        :returns: ``(tag, value)`` pairs completed by this chunk, in order.
+        :rtype: list[tuple[str, str]]
+        """
+        self.buffer += text
+        completed = []
+        for match in TAG_PATTERN.finditer(self.buffer, self.pos):
+            tag = match.group(1).upper()
+            self.pos = match.end()
+            if self.tags is not None and tag not in self.tags:
+                continue
+            value = match.group(2).strip()
+            self.values[tag] = value
+            completed.append((tag, value))
+        if not completed and self.pos < len(self.buffer):
+            # Skip text that cannot start a tag; keep a possible open tag.
+            start = self.buffer.find("<", self.pos)
+            self.pos = len(self.buffer) if start == -1 else start
+        return completed
+
+    def has_all(self, tags):
+        """Whether every tag in ``tags`` has been completed."""
+        return all(tag.upper() in self.values for tag in tags)
+
+    def get(self, tag, default=None):
+        return self.values.get(tag.upper(), default)
+
+    @property
+    def text(self):
+        """The full text received so far."""
+        return self.buffer
@@ -9,6 +9,7 @@ multimodal sensors. Designed for integration into the Satori AR assistant system
 
 from ptgctl_pipeline.ptgctl_pipeline.pipeline.base import BasePipeline
 from ptgctl_pipeline.ptgctl_pipeline.codec import JsonCodec, HoloframeCodec, BytesCodec, StringCodec
+from ptgctl_pipeline.ptgctl_pipeline.codec import typed_json_codec, StepCheckpointPrediction, TaskState
 from ptgctl_pipeline.ptgctl_pipeline.stream import StreamConfig
 from ptgctl_pipeline.ptgctl_pipeline.pipeline.examples import GPT4VPipeline, FramePipeline
 
@@ -121,9 +122,9 @@ class TaskControlPipeline(BasePipeline):
 
         self.add_input_streams(
             [
-                StreamConfig(TaskControlPipeline.IMAGE_INPUT_STREAM_NAME, HoloframeCodec), 
+                StreamConfig(TaskControlPipeline.IMAGE_INPUT_STREAM_NAME, HoloframeCodec, readonly=True, coalesce=True), 
                 StreamConfig("intent:task_plan", JsonCodec), 
-                StreamConfig("intent:pred:step:checkpoints", JsonCodec), 
+                StreamConfig("intent:pred:step:checkpoints", typed_json_codec(StepCheckpointPrediction)), 
                 StreamConfig("intent:pred:guidance", JsonCodec), 
                 StreamConfig("assistant:fast_activate", JsonCodec), 
                 StreamConfig("assistant:slow_activate", JsonCodec),
@@ -144,7 +145,7 @@ class TaskControlPipeline(BasePipeline):
                 StreamConfig("intent:trigger:guidance", JsonCodec),
                 StreamConfig("intent:trigger:action", JsonCodec),
                 StreamConfig("assistant:summary", JsonCodec),
-                StreamConfig("intent:task:state", JsonCodec)
+                StreamConfig("intent:task:state", typed_json_codec(TaskState))
             ]
         )
         self.frame = None
@@ -199,6 +200,9 @@ class TaskControlPipeline(BasePipeline):
                     self.states['step_change'] = True
 
         elif sid == "intent:pred:guidance":
+            if message.get('partial'):
+                # Streamed partial guidance is only for display; keep the last complete one.
+                return
             next_action_id = self.task_machine.get_next_action_id()
             step_index = message['input_action']['step_index']
             self.guidance_pred[step_index] = message
@@ -365,15 +369,15 @@ class TaskControlPipeline(BasePipeline):
         if len(current_step_desc) > 100:
             current_step_desc = current_step_desc[:100] + "..."
         next_step_index = self.task_machine.get_next_action_id()
-        return {
-            "current_step": current_step_desc,
-            "checkpoints": list(map(lambda x: x['instruction'], self.task_machine.get_current_step()['checkpoints'])),
-            "checkpoint_states": checkpoint_states,
-            "step_status": self.task_machine.current_step_state.state,
-            "allow_next": (next_step_index in self.guidance_pred) and current_step_index < len(self.task_machine.task_schema['steps']) - 1,
-            "allow_prev": current_step_index > 0,
-            "step_id":current_step_index_to_show 
-        }
+        return TaskState(
+            current_step=current_step_desc,
+            checkpoints=list(map(lambda x: x['instruction'], self.task_machine.get_current_step()['checkpoints'])),
+            checkpoint_states=checkpoint_states,
+            step_status=self.task_machine.current_step_state.state,
+            allow_next=(next_step_index in self.guidance_pred) and current_step_index < len(self.task_machine.task_schema['steps']) - 1,
+            allow_prev=current_step_index > 0,
+            step_id=current_step_index_to_show,
+        )
         
     def schedule_new_guidance(self):
         """
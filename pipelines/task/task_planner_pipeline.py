@@ -22,6 +22,7 @@ import re
 import json
 import xml.etree.ElementTree as ET
 from .helper import load_default_system_prompt
+from .helper.tag_parser import strip_code_fence
 from .task_plans import TASK_PLAN_MAP
 
 
@@ -102,6 +103,7 @@ class TaskPlannerPipeline(GPT4VPipeline):
     IMAGE_INPUT_STREAM_NAME = "main"
     TRIGGER_STREAM = "intent:trigger-planner"
     OUTPUT_STREAM = "intent:task_plan"
+    CONCAT_RESIZE_RATIO = 0.3
     
     def __init__(self, 
         system_prompt: str = load_default_system_prompt(
@@ -134,7 +136,8 @@ class TaskPlannerPipeline(GPT4VPipeline):
             buffer_limit=2
         )
         self.add_input_streams([
-            StreamConfig(TaskPlannerPipeline.IMAGE_INPUT_STREAM_NAME, HoloframeCodec)
+            StreamConfig(TaskPlannerPipeline.IMAGE_INPUT_STREAM_NAME, HoloframeCodec, readonly=True, coalesce=True,
+                         resolutions=(self.CONCAT_RESIZE_RATIO,))
         ])
         self.add_trigger_streams([TaskPlannerPipeline.TRIGGER_STREAM])
         self.add_output_streams([StreamConfig(TaskPlannerPipeline.OUTPUT_STREAM, JsonCodec)])
@@ -151,7 +154,7 @@ class TaskPlannerPipeline(GPT4VPipeline):
         Returns:
             None. Sets internal state to prepare for future trigger.
         """
-        if self.busy:
+        if not self.is_accepting_input():
             return 
         if await self.check_and_process_image_stream(message, sid):
             pass
@@ -177,8 +180,8 @@ class TaskPlannerPipeline(GPT4VPipeline):
         start_time = time.time()
         
         self.enabled = True
-        if self.concat_image_set:
-            concat_image = cv2.resize(self.concat_image, (0, 0), fx=0.3, fy=0.3)
+        flag, concat_image = await self.get_concat_image()
+        if flag:
             origin_response = await self.fetch_gpt_response_async(concat_image)
             self.enabled = False
             if self.postprocess:
@@ -212,7 +215,4 @@ class TaskPlannerPipeline(GPT4VPipeline):
                 - steps: List of step dicts with checkpoints and status prompts
                 - objects: List of required object names
         """
-        result = result.strip()
-        if result.startswith("xml"):
-            result = result[3:]
-        return parse_xml_to_dict(result)
\ No newline at end of file
+        return parse_xml_to_dict(strip_code_fence(result))
\ No newline at end of file
@@ -1,5 +1,6 @@
 ARRANGE_FLOWERS_TASK_PLAN = {
     'desired_task': 'Arrange Flowers',
+    'scene_description': 'Arranging flowers in a vase, with various flowers and floral supplies present',
     'steps': [
         {
             'is_start': True,
@@ -1,5 +1,6 @@
 CLEAN_ROOM_TASK_PLAN = {
     'desired_task': 'Clean Room',
+    'scene_description': 'Someone cleaning a room with a mop, showing cleaning supplies and wet floor',
     'steps': [
         {
             'is_start': True,
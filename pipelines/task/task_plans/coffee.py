@@ -1,5 +1,6 @@
 COFFEE_TASK_PLAN = {
     'desired_task': 'Brewing Pour-Over Coffee', 
+    'scene_description': 'A person making coffee, with items like a coffee machine, grinder, kettle, or coffee beans visible',
     'steps': [
         {'is_start': True, 
         'checkpoints': [
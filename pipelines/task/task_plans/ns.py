@@ -1,5 +1,6 @@
 CONNECT_SWITCH_TASK_PLAN = {
     'desired_task': 'Connect Switch',
+    'scene_description': 'Connecting a Nintendo Switch console to a TV or monitor, with cables and gaming equipment visible',
     'steps': [
         {
             'is_start': True,
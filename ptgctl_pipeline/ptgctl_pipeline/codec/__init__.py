@@ -1,13 +1,27 @@
 from .base import BaseCodec
-from .holoframe_codec import HoloframeCodec
-from .json_codec import JsonCodec
+from .holoframe_codec import HoloframeCodec, LazyHoloframe
+from .json_codec import JsonCodec, TypedJsonCodec, typed_json_codec
+from .json_backend import JsonBackend, get_json_backend
+from .schemas import FuzzyValue, StepCheckpointPrediction, TaskState
 from .string_codec import StringCodec
 from .bytes import BytesCodec
+from .buffer import BufferReader, as_bytes, as_upload
 
 __all__ = [
     "BaseCodec",
     "HoloframeCodec",
+    "LazyHoloframe",
     "JsonCodec",
+    "TypedJsonCodec",
+    "typed_json_codec",
+    "JsonBackend",
+    "get_json_backend",
+    "FuzzyValue",
+    "StepCheckpointPrediction",
+    "TaskState",
     "StringCodec",
     "BytesCodec",
+    "BufferReader",
+    "as_bytes",
+    "as_upload",
 ]
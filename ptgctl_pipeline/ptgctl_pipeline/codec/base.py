@@ -7,6 +7,11 @@ class BaseCodec(ABC):
 
     Subclasses must implement `encode` and `decode` class methods to define
     how stream data should be serialized and deserialized.
+
+    Codecs work on buffer-protocol objects end to end: `decode` must accept
+    any bytes-like input (``bytes``, ``bytearray``, ``memoryview``) without
+    requiring a ``bytes`` copy, and `encode` may return any bytes-like object,
+    which is streamed to the server as-is.
     """
 
     @classmethod
@@ -19,7 +24,7 @@ class BaseCodec(ABC):
             data (Any): The raw input data to encode.
 
         Returns:
-            Any: Encoded representation suitable for transmission or storage.
+            bytes-like: Encoded representation suitable for transmission or storage.
         """
         pass
 
@@ -30,9 +35,26 @@ class BaseCodec(ABC):
         Decode the input data back into its original format.
 
         Args:
-            data (Any): Encoded data received from a stream.
+            data (bytes-like): Encoded data received from a stream.
 
         Returns:
             Any: Decoded original data.
         """
         pass
+
+    @classmethod
+    def decode_entry(cls, data, entry_id=None):
+        """
+        Decode a stream entry given its entry ID.
+
+        Codecs that expose entry metadata override this; by default the entry
+        ID is ignored and `decode` is used.
+
+        Args:
+            data (bytes-like): Encoded data received from a stream.
+            entry_id (str): Stream entry ID (``"<timestamp>-<seq>"``), if known.
+
+        Returns:
+            Any: Decoded original data.
+        """
+        return cls.decode(data)
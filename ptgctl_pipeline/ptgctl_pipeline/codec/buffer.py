@@ -0,0 +1,84 @@
+import io
+
+
+def as_bytes(data) -> bytes:
+    """
+    Return the content of a bytes-like object as ``bytes``.
+
+    ``bytes`` input is returned as-is; other buffer-protocol objects
+    (``bytearray``, ``memoryview``, NumPy arrays) are copied once.
+
+    Args:
+        data (bytes-like): Any object supporting the buffer protocol.
+
+    Returns:
+        bytes: The buffer content.
+    """
+    if isinstance(data, bytes):
+        return data
+    return memoryview(data).tobytes()
+
+
+def as_upload(data):
+    """
+    Prepare an encoded payload for a multipart HTTP upload.
+
+    ``bytes`` and ``str`` are passed through. Other bytes-like objects are
+    wrapped in a ``BufferReader`` so the HTTP client streams them straight
+    from the original buffer instead of copying them into ``bytes`` first.
+
+    Args:
+        data (str | bytes-like): Encoded stream payload.
+
+    Returns:
+        str | bytes | BufferReader: Payload accepted as multipart file content.
+    """
+    if isinstance(data, (bytes, str)):
+        return data
+    return BufferReader(data)
+
+
+class BufferReader(io.RawIOBase):
+    """
+    Seekable, read-only file object over a buffer-protocol object.
+
+    Reads copy directly from the underlying buffer into the caller's buffer,
+    so the payload is never materialized as a separate ``bytes`` object.
+
+    Args:
+        data (bytes-like): Any object supporting the buffer protocol.
+    """
+
+    def __init__(self, data):
+        super().__init__()
+        self._view = memoryview(data).cast("B")
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, b):
+        n = max(0, min(len(b), len(self._view) - self._pos))
+        b[:n] = self._view[self._pos:self._pos + n]
+        self._pos += n
+        return n
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._pos + offset
+        elif whence == io.SEEK_END:
+            position = len(self._view) + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if position < 0:
+            raise ValueError("Negative seek position")
+        self._pos = position
+        return self._pos
+
+    def tell(self):
+        return self._pos
@@ -6,6 +6,7 @@ class BytesCodec(BaseCodec):
     A pass-through codec that returns data unchanged.
 
     This is useful for raw byte streams or when encoding/decoding is unnecessary.
+    Bytes-like objects such as ``memoryview`` are passed through without copying.
     """
 
     @classmethod
@@ -1,5 +1,104 @@
+from collections.abc import Mapping
+
 from .base import BaseCodec
 from ptgctl import holoframe
+from ..utils.time import parse_tms
+from ..utils.readonly import make_readonly
+from ..utils.pyramid import FramePyramid
+
+
+class LazyHoloframe(Mapping):
+    """
+    Holoframe message that defers decoding until its content is accessed.
+
+    Metadata derived from the stream entry (``entry_id``, ``timestamp``) and
+    the payload size are available immediately. The first key access decodes
+    the whole frame with ``holoframe.load`` and caches it, so frames that a
+    pipeline drops (downsampling, busy state) are never decoded.
+
+    Attributes:
+        buffer (bytes-like): Encoded holoframe payload.
+        entry_id (str): Stream entry ID of the message, if known.
+    """
+
+    def __init__(self, buffer, entry_id=None):
+        self.buffer = buffer
+        self.entry_id = entry_id
+        self._frame = None
+        self._readonly = False
+        self._pyramid = None
+        self._resolutions = set()
+
+    @property
+    def timestamp(self):
+        """Stream entry timestamp in milliseconds, or None if unknown."""
+        return parse_tms(self.entry_id) if self.entry_id else None
+
+    @property
+    def nbytes(self):
+        """Size of the encoded payload in bytes."""
+        return memoryview(self.buffer).nbytes
+
+    @property
+    def is_decoded(self):
+        return self._frame is not None
+
+    def decode(self):
+        """Decode the frame (once) and return the decoded dict."""
+        if self._frame is None:
+            frame = holoframe.load(self.buffer)
+            self._frame = make_readonly(frame) if self._readonly else frame
+        return self._frame
+
+    def freeze(self):
+        """Mark the frame as shared; its arrays become read-only once decoded."""
+        self._readonly = True
+        if self._frame is not None:
+            make_readonly(self._frame)
+        if self._pyramid is not None:
+            self._pyramid.readonly = True
+            make_readonly(list(self._pyramid.levels.values()))
+
+    def declare_resolutions(self, resolutions):
+        """Register image resolutions that subscribers of this frame will request."""
+        self._resolutions.update(resolutions)
+        if self._pyramid is not None:
+            self._pyramid.declare(resolutions)
+
+    def get_image(self, resolution=1.0, rgb: bool = False):
+        """
+        Return the frame image at ``resolution``.
+
+        ``holoframe.load`` always decodes at full resolution, so reduced
+        resolutions are produced by area interpolation of the decoded image.
+        Levels are cached in a ``FramePyramid`` shared by every pipeline that
+        receives this frame.
+
+        Args:
+            resolution (float | int | tuple): Scale factor, shortest edge or
+                ``(width, height)``; see ``resolve_size``.
+            rgb (bool): Convert from BGR to RGB.
+
+        Returns:
+            np.ndarray: The (resized) image.
+        """
+        if self._pyramid is None:
+            self._pyramid = FramePyramid(self["image"], readonly=self._readonly)
+            self._pyramid.declare(self._resolutions)
+        return self._pyramid.get(resolution, rgb=rgb)
+
+    def __getitem__(self, key):
+        return self.decode()[key]
+
+    def __iter__(self):
+        return iter(self.decode())
+
+    def __len__(self):
+        return len(self.decode())
+
+    def __repr__(self):
+        state = "decoded" if self.is_decoded else "pending"
+        return f"LazyHoloframe(entry_id={self.entry_id!r}, nbytes={self.nbytes}, {state})"
 
 
 class HoloframeCodec(BaseCodec):
@@ -7,7 +106,8 @@ class HoloframeCodec(BaseCodec):
     Codec for encoding and decoding data using ptgctl's holoframe format.
 
     This codec is suitable for structured sensor/frame data requiring
-    serialization through the holoframe protocol.
+    serialization through the holoframe protocol. Decoding is lazy: it
+    returns a ``LazyHoloframe`` that decodes on first access.
     """
 
     @classmethod
@@ -24,14 +124,28 @@ class HoloframeCodec(BaseCodec):
         return holoframe.dump_v3(value)
 
     @classmethod
-    def decode(cls, value: bytes):
+    def decode(cls, value):
         """
         Decode data from holoframe format.
 
         Args:
-            value (bytes): Encoded byte stream.
+            value (bytes-like): Encoded byte stream.
+
+        Returns:
+            LazyHoloframe: Frame decoded on first access.
+        """
+        return LazyHoloframe(value)
+
+    @classmethod
+    def decode_entry(cls, value, entry_id=None):
+        """
+        Decode a stream entry, keeping its entry ID as frame metadata.
+
+        Args:
+            value (bytes-like): Encoded byte stream.
+            entry_id (str): Stream entry ID.
 
         Returns:
-            Any: Decoded structured data.
+            LazyHoloframe: Frame decoded on first access.
         """
-        return holoframe.load(value)
+        return LazyHoloframe(value, entry_id=entry_id)
@@ -0,0 +1,167 @@
+import os
+import re
+import json
+import math
+
+from .buffer import as_bytes
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - optional dependency
+    msgspec = None
+
+# Integers of 19 digits or more may not fit in 64 bits, which the fast
+# backends decode as floats; such payloads are decoded with the stdlib.
+WIDE_NUMBER_PATTERN = re.compile(rb"\d{19,}")
+WIDE_NUMBER_TEXT_PATTERN = re.compile(r"\d{19,}")
+
+
+class JsonBackend:
+    """
+    Serializer used by the JSON codecs.
+
+    All backends produce UTF-8 JSON that decodes to the same Python values as
+    the stdlib ``json`` module. The exact bytes may differ (e.g. whitespace,
+    non-ASCII characters are emitted as UTF-8 instead of ``\\u`` escapes).
+    Objects a fast backend cannot serialize fall back to the stdlib encoder.
+    """
+    name = "base"
+
+    def dumps(self, data) -> bytes:
+        raise NotImplementedError("Subclasses must implement dumps method")
+
+    def loads(self, buffer):
+        raise NotImplementedError("Subclasses must implement loads method")
+
+
+class StdlibJsonBackend(JsonBackend):
+    """JSON backend based on the standard library ``json`` module."""
+    name = "json"
+
+    def dumps(self, data) -> bytes:
+        return json.dumps(data).encode("utf-8")
+
+    def loads(self, buffer):
+        if not isinstance(buffer, (bytes, bytearray, str)):
+            # json.loads only parses bytes, bytearray and str.
+            buffer = as_bytes(buffer)
+        return json.loads(buffer)
+
+
+class FastJsonBackend(StdlibJsonBackend):
+    """
+    Base of the third-party backends.
+
+    Where they would not round-trip like the stdlib, the stdlib is used
+    instead: NaN and infinity (encoded as ``null`` by the fast encoders,
+    and emitted as ``NaN`` / ``Infinity`` by the stdlib), and integers
+    wider than 64 bits (decoded as floats by the fast decoders).
+    """
+    decode_errors = (ValueError,)
+
+    def fast_dumps(self, data) -> bytes:
+        raise NotImplementedError("Subclasses must implement fast_dumps method")
+
+    def fast_loads(self, buffer):
+        raise NotImplementedError("Subclasses must implement fast_loads method")
+
+    def dumps(self, data) -> bytes:
+        try:
+            encoded = self.fast_dumps(data)
+        except TypeError:
+            return super().dumps(data)
+        if b"null" in encoded and has_non_finite_float(data):
+            return super().dumps(data)
+        return encoded
+
+    def loads(self, buffer):
+        pattern = WIDE_NUMBER_TEXT_PATTERN if isinstance(buffer, str) else WIDE_NUMBER_PATTERN
+        if pattern.search(buffer):
+            return super().loads(buffer)
+        try:
+            return self.fast_loads(buffer)
+        except self.decode_errors:
+            # E.g. NaN or Infinity; invalid JSON raises the stdlib error.
+            return super().loads(buffer)
+
+
+class OrjsonBackend(FastJsonBackend):
+    """JSON backend based on ``orjson``; also serializes NumPy values and non-str keys."""
+    name = "orjson"
+    OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) if orjson else 0
+
+    def fast_dumps(self, data) -> bytes:
+        return orjson.dumps(data, option=self.OPTIONS)
+
+    def fast_loads(self, buffer):
+        return orjson.loads(buffer)
+
+
+class MsgspecBackend(FastJsonBackend):
+    """JSON backend based on ``msgspec``."""
+    name = "msgspec"
+    decode_errors = (msgspec.DecodeError,) if msgspec else ()
+
+    def __init__(self):
+        self.encoder = msgspec.json.Encoder()
+        self.decoder = msgspec.json.Decoder()
+
+    def fast_dumps(self, data) -> bytes:
+        return self.encoder.encode(data)
+
+    def fast_loads(self, buffer):
+        return self.decoder.decode(buffer)
+
+
+def has_non_finite_float(data) -> bool:
+    """Whether a JSON-like value contains a NaN or infinite float."""
+    if isinstance(data, float):
+        return not math.isfinite(data)
+    if isinstance(data, dict):
+        return any(has_non_finite_float(value) for value in data.values())
+    if isinstance(data, (list, tuple)):
+        return any(has_non_finite_float(value) for value in data)
+    return False
+
+
+JSON_BACKENDS = {
+    "orjson": (OrjsonBackend, orjson),
+    "msgspec": (MsgspecBackend, msgspec),
+    "json": (StdlibJsonBackend, json),
+}
+
+
+def get_json_backend(name: str = "auto") -> JsonBackend:
+    """
+    Select a JSON backend by name.
+
+    Args:
+        name (str): ``"orjson"``, ``"msgspec"``, ``"json"``, or ``"auto"`` to pick
+            the fastest installed backend (orjson, then msgspec, then stdlib).
+
+    Returns:
+        JsonBackend: The selected backend.
+
+    Raises:
+        ValueError: If the backend is unknown or not installed.
+    """
+    if name == "auto":
+        for backend_cls, module in JSON_BACKENDS.values():
+            if module is not None:
+                return backend_cls()
+    if name not in JSON_BACKENDS:
+        raise ValueError(f"Unknown JSON backend: {name}")
+    backend_cls, module = JSON_BACKENDS[name]
+    if module is None:
+        raise ValueError(f"JSON backend '{name}' is not installed")
+    return backend_cls()
+
+
+def default_json_backend() -> JsonBackend:
+    """Backend selected by the ``PTGCTL_JSON_BACKEND`` environment variable (default: auto)."""
+    return get_json_backend(os.getenv("PTGCTL_JSON_BACKEND", "auto"))
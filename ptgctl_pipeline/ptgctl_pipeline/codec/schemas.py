@@ -0,0 +1,58 @@
+"""
+Typed message schemas for well-known JSON streams.
+
+These dataclasses describe the payloads of streams with a fixed structure and
+are meant to be used with ``typed_json_codec``.
+"""
+
+from dataclasses import dataclass, field
+from typing import List
+
+
+@dataclass
+class FuzzyValue:
+    """
+    A prediction value with its confidence.
+
+    Attributes:
+        value (float): Predicted value in [0, 1].
+        confidence (float): Confidence of the prediction in [0, 1].
+    """
+    value: float = 0.
+    confidence: float = 0.
+
+
+@dataclass
+class StepCheckpointPrediction:
+    """
+    Payload of ``intent:pred:step:checkpoints``.
+
+    Attributes:
+        checkpoint_predictions (list[FuzzyValue]): One prediction per checkpoint of the current step.
+        in_step (FuzzyValue): Whether the user is still working on the current step.
+    """
+    checkpoint_predictions: List[FuzzyValue] = field(default_factory=list)
+    in_step: FuzzyValue = field(default_factory=FuzzyValue)
+
+
+@dataclass
+class TaskState:
+    """
+    Payload of ``intent:task:state``.
+
+    Attributes:
+        current_step (str): Description of the current step.
+        checkpoints (list[str]): Checkpoint instructions of the current step.
+        checkpoint_states (list[str]): Fuzzy state of each checkpoint.
+        step_status (str): Fuzzy state of the current step.
+        allow_next (bool): Whether the user may move to the next step.
+        allow_prev (bool): Whether the user may go back to the previous step.
+        step_id (int): Index of the current step, or -1 before the first transition.
+    """
+    current_step: str = ""
+    checkpoints: List[str] = field(default_factory=list)
+    checkpoint_states: List[str] = field(default_factory=list)
+    step_status: str = ""
+    allow_next: bool = False
+    allow_prev: bool = False
+    step_id: int = -1
@@ -27,9 +27,9 @@ class StringCodec(BaseCodec):
         Decode UTF-8 bytes into a string.
 
         Args:
-            data (bytes): UTF-8 encoded byte string.
+            data (bytes-like): UTF-8 encoded byte string.
 
         Returns:
             str: Decoded string.
         """
-        return data.decode("utf-8")
+        return str(data, "utf-8")
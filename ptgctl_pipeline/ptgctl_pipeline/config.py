@@ -39,11 +39,14 @@ class StreamServerConfig:
         url (str): Server URL.
         username (str): Authentication username.
         password (str): Authentication password.
+        batch_upload (bool): Whether the server accepts multi-stream uploads
+            (``POST /data/<sid1>+<sid2>``) for posting several outputs at once.
     """
-    def __init__(self, url: str, username: str, password: str):
+    def __init__(self, url: str, username: str, password: str, batch_upload: bool = False):
         self.url = url
         self.username = username
         self.password = password
+        self.batch_upload = batch_upload
 
 
 def read_config(config_name: str = "default") -> StreamServerConfig:
@@ -62,5 +65,6 @@ def read_config(config_name: str = "default") -> StreamServerConfig:
         return StreamServerConfig(
             url=config_json["url"],
             username=config_json["username"],
-            password=config_json["password"]
+            password=config_json["password"],
+            batch_upload=config_json.get("batch_upload", False),
         )
@@ -1,13 +1,17 @@
 import asyncio
-import signal
 import requests
 import httpx
 import ptgctl
 
 from .config import PTG_PASSWORD, PTG_USERNAME, PTG_URL
-from .logger import Logger, ConsoleLogHandler, TimeFormatter, JSONLogHandler
-from .utils.request import ProcessManager
+from .logger import Logger, ConsoleLogHandler, TimeFormatter, JSONLinesLogHandler
+from .utils.scheduler import TriggerScheduler, AdaptiveRatePolicy
+from .utils.bounded_queue import BoundedQueue
+from .utils.readonly import make_readonly
+from .codec import as_upload
+from .llm import close_llm_client
 import traceback
+import time
 import os
 
 class PipelineServer:
@@ -18,9 +22,38 @@ class PipelineServer:
     - Connect to ptgctl streams (input, trigger, output)
     - Route stream events to corresponding pipelines
     - Handle trigger execution and output result posting
-    - Manage internal queue and lifecycle
+    - Manage per-pipeline input mailboxes, trigger queues and lifecycle
+
+    Each pipeline gets its own bounded trigger queue drained by at most
+    ``max_in_flight`` workers, so a slow pipeline only backs up (and drops)
+    its own triggers. Queue settings come from ``DEFAULT_TRIGGER_QUEUE``,
+    overridden by ``set_trigger_queue_defaults`` and then by each pipeline's
+    ``trigger_queue_config``.
+
+    Input messages are likewise routed into a per-pipeline mailbox drained by
+    a dedicated worker, so the websocket loop never waits on
+    ``on_input_stream``. Messages of streams declared with ``coalesce=True``
+    replace any pending message of the same stream (latest value wins), in
+    mailboxes as well as trigger queues.
+    Mailbox settings follow the same scheme with ``DEFAULT_INPUT_MAILBOX``.
     """
 
+    DEFAULT_TRIGGER_QUEUE = {
+        "maxsize": 4,
+        "overflow": "drop-oldest",
+        "max_in_flight": 1,
+    }
+
+    DEFAULT_INPUT_MAILBOX = {
+        "maxsize": 64,
+        "overflow": "drop-oldest",
+    }
+
+    DEFAULT_HTTP_LIMITS = {
+        "max_connections": 20,
+        "max_keepalive_connections": 10,
+    }
+
     def __init__(self, config):
         self.config = config
         self.pipelines = []
@@ -31,32 +64,102 @@ class PipelineServer:
             url=config.url
         )
         self.url = config.url
-        self.data_queue = asyncio.Queue()
+        self.trigger_queue_defaults = dict(self.DEFAULT_TRIGGER_QUEUE)
+        self.trigger_queues = []
+        self.input_mailbox_defaults = dict(self.DEFAULT_INPUT_MAILBOX)
+        self.input_mailboxes = []
+        self.metrics_interval = 0
+        self.http_client = None
+        self.batch_upload = getattr(config, "batch_upload", False)
 
         # Setup logger
         self.logger = Logger()
         formatter = TimeFormatter()
         self.logger.add_handler(ConsoleLogHandler(formatter))
-        self.logger.add_handler(JSONLogHandler("log"))
+        self.logger.add_handler(JSONLinesLogHandler("log"))
 
         self.init_request()
-        self.trigger_streams = {}
-        self.trigger_interval = 1
-        self.process_manager = ProcessManager(self.headers)
+        self.input_index, self.trigger_index = {}, {}
+        self.trigger_scheduler = TriggerScheduler(
+            self.route_message, mirror=self.mirror_trigger, load=self.get_trigger_load
+        )
+        self.service_times = []
+        self.in_flight = []
+        self.background_tasks = set()
+        self.pending_emits = {}
 
     def register_pipeline(self, pipeline):
         """Registers a pipeline to the server."""
         self.pipelines.append(pipeline)
         pipeline.on_registering_pipeline(self)
 
-    def register_trigger(self, stream_name, interval=1):
-        """Sets the trigger stream and polling interval."""
-        self.trigger_streams[stream_name] = {
-            'stream_name': stream_name,
-            "interval": interval,
-        }
-        # self.trigger_stream = stream_name
-        # self.trigger_interval = interval
+    def set_trigger_queue_defaults(self, queue_config):
+        """Overrides the default trigger queue settings for all pipelines."""
+        self.trigger_queue_defaults.update(queue_config or {})
+
+    def get_trigger_queue_config(self, pipeline):
+        """Resolves the trigger queue settings of a pipeline."""
+        return {**self.trigger_queue_defaults, **(pipeline.trigger_queue_config or {})}
+
+    def build_trigger_queues(self):
+        """Creates one bounded trigger queue per registered pipeline."""
+        self.trigger_queues = []
+        self.service_times = [0.0] * len(self.pipelines)
+        self.in_flight = [0] * len(self.pipelines)
+        for pipeline in self.pipelines:
+            queue_config = self.get_trigger_queue_config(pipeline)
+            self.trigger_queues.append(
+                BoundedQueue(maxsize=queue_config["maxsize"], overflow=queue_config["overflow"])
+            )
+
+    def set_input_mailbox_defaults(self, mailbox_config):
+        """Overrides the default input mailbox settings for all pipelines."""
+        self.input_mailbox_defaults.update(mailbox_config or {})
+
+    def get_input_mailbox_config(self, pipeline):
+        """Resolves the input mailbox settings of a pipeline."""
+        return {**self.input_mailbox_defaults, **(pipeline.input_mailbox_config or {})}
+
+    def build_input_mailboxes(self):
+        """Creates one bounded input mailbox per registered pipeline."""
+        self.input_mailboxes = []
+        for pipeline in self.pipelines:
+            mailbox_config = self.get_input_mailbox_config(pipeline)
+            self.input_mailboxes.append(
+                BoundedQueue(maxsize=mailbox_config["maxsize"], overflow=mailbox_config["overflow"])
+            )
+
+    def register_trigger(self, stream_name, interval=1, jitter=0.0, mirror=False, adaptive=None):
+        """
+        Schedules a periodic trigger stream.
+
+        Args:
+            stream_name (str): Server-side trigger stream ID.
+            interval (float): Period between triggers in seconds.
+            jitter (float): Maximum random offset of each tick, as a fraction of the interval.
+            mirror (bool): Also post each tick to the remote stream for external listeners.
+            adaptive (dict): Optional ``AdaptiveRatePolicy`` settings (``min_interval``,
+                ``max_interval``, ``increase``, ``decrease``) adapting the interval to
+                the service time and queue depth of the triggered pipelines.
+        """
+        policy = AdaptiveRatePolicy(**adaptive) if adaptive else None
+        self.trigger_scheduler.add_trigger(stream_name, interval, jitter=jitter, mirror=mirror, policy=policy)
+
+    def get_trigger_load(self, stream_name):
+        """
+        Reports the load of the pipelines triggered by a stream.
+
+        Returns:
+            tuple[float, int]: The largest per-trigger service time (smoothed and
+            divided by the pipeline's concurrency) and the largest number of
+            pending triggers among the triggered pipelines.
+        """
+        service_time, backlog = 0.0, 0
+        for i in self.trigger_index.get(stream_name, []):
+            max_in_flight = self.get_trigger_queue_config(self.pipelines[i])["max_in_flight"]
+            service_time = max(service_time, self.service_times[i] / max_in_flight)
+            backlog = max(backlog, self.trigger_queues[i].qsize())
+        return service_time, backlog
 
     def init_request(self):
         """Initializes token-based headers for REST API usage."""
@@ -76,30 +179,148 @@ class PipelineServer:
 
     async def producer(self):
         """Listens to input and trigger streams, routes to pipelines."""
-        in_idx, trig_idx = self.build_pipeline_stream_index()
-        sids = list(set(in_idx.keys()) | set(trig_idx.keys()))
+        # Scheduled triggers are generated locally; listening to them as well
+        # would deliver mirrored ticks twice.
+        scheduled = set(self.trigger_scheduler.get_stream_names())
+        sids = list((set(self.input_index.keys()) | set(self.trigger_index.keys())) - scheduled)
         async with self.api.data_pull_connect(sids, ack=True) as ws:
             self.info("Start Listening...", "PipelineServer")
             while True:
                 for sid, t, buffer in await ws.recv_data():
-                    for i in in_idx.get(sid, []):
-                        internal_sid = self.pipelines[i].get_internal_sid(sid)
-                        data = self.pipelines[i].decode_stream_data(internal_sid, buffer)
-                        await self.pipelines[i].on_input_stream(data, internal_sid)
-                    for i in trig_idx.get(sid, []):
-                        internal_sid = self.pipelines[i].get_internal_sid(sid)
-                        await self.data_queue.put({"pipeline_index": i, "sid": internal_sid, "buffer": buffer})
+                    self.route_message(sid, buffer, t)
+
+    def route_message(self, sid, buffer, entry_id=None):
+        """Routes one stream message to the mailboxes and trigger queues of its subscribers."""
+        # Shared by every read-only subscriber of this message, so each codec
+        # decodes it at most once.
+        decoded_cache = {}
+        for i in self.input_index.get(sid, []):
+            internal_sid = self.pipelines[i].get_internal_sid(sid)
+            accepted = self.input_mailboxes[i].put_nowait(
+                {"pipeline_index": i, "sid": internal_sid, "buffer": buffer,
+                 "entry_id": entry_id, "decoded_cache": decoded_cache},
+                key=internal_sid,
+                # Coalesced streams always coalesce; others follow the mailbox policy.
+                coalesce=self.pipelines[i].is_coalesced_stream(internal_sid) or None,
+            )
+            if not accepted:
+                self.debug(f"Input dropped for {self.pipelines[i].name}", "route_message")
+        for i in self.trigger_index.get(sid, []):
+            internal_sid = self.pipelines[i].get_internal_sid(sid)
+            accepted = self.trigger_queues[i].put_nowait(
+                {"pipeline_index": i, "sid": internal_sid, "buffer": buffer,
+                 "entry_id": entry_id, "decoded_cache": decoded_cache},
+                key=internal_sid,
+                coalesce=self.pipelines[i].is_coalesced_stream(internal_sid) or None,
+            )
+            if not accepted:
+                self.debug(f"Trigger dropped for {self.pipelines[i].name}", "route_message")
+
+    def mirror_trigger(self, sid, buffer):
+        """Posts a locally scheduled trigger to the remote stream without waiting for it."""
+        task = asyncio.create_task(self.send_request([sid], [buffer]))
+        self.background_tasks.add(task)
+        task.add_done_callback(self.background_tasks.discard)
+
+    def decode_stream_data(self, pipeline, internal_sid, buffer, decoded_cache, entry_id=None):
+        """
+        Decodes a message for one pipeline.
+
+        Read-only streams are decoded once per (message, codec) and the same
+        read-only object is handed to every read-only subscriber; other
+        streams get a private decode. Image resolutions declared by the
+        pipeline are registered on frames that support it.
+        """
+        if not pipeline.is_readonly_stream(internal_sid):
+            decoded = pipeline.decode_stream_data(internal_sid, buffer, entry_id)
+        else:
+            codec = pipeline.get_stream_codec(internal_sid)
+            if codec not in decoded_cache:
+                decoded_cache[codec] = make_readonly(codec.decode_entry(buffer, entry_id))
+            decoded = decoded_cache[codec]
+        resolutions = pipeline.get_stream_resolutions(internal_sid)
+        if resolutions and hasattr(decoded, "declare_resolutions"):
+            decoded.declare_resolutions(resolutions)
+        return decoded
+
+    async def input_dispatcher(self):
+        """Runs the input worker of every pipeline."""
+        await asyncio.gather(*(self.input_worker(i) for i in range(len(self.pipelines))))
+
+    async def input_worker(self, pipeline_index):
+        """Drains the input mailbox of a single pipeline."""
+        mailbox = self.input_mailboxes[pipeline_index]
+        pipeline = self.pipelines[pipeline_index]
+        while True:
+            data = await mailbox.get()
+            try:
+                decoded = self.decode_stream_data(
+                    pipeline, data['sid'], data['buffer'], data['decoded_cache'], data['entry_id']
+                )
+                await pipeline.on_input_stream(decoded, data['sid'])
+            except Exception as e:
+                self.error(f"Input processing failed: {e}\n{traceback.format_exc()}", pipeline.name)
+
+    def get_metrics(self):
+        """Returns mailbox, trigger queue and pipeline-specific statistics for every pipeline."""
+        return {
+            pipeline.name: {
+                "input_mailbox": mailbox.stats(),
+                "trigger_queue": queue.stats(),
+                "in_flight": in_flight,
+                "service_time": service_time,
+                **pipeline.get_metrics(),
+            }
+            for pipeline, mailbox, queue, in_flight, service_time in zip(
+                self.pipelines, self.input_mailboxes, self.trigger_queues, self.in_flight, self.service_times
+            )
+        }
+
+    async def metrics_reporter(self):
+        """Periodically logs queue and cache metrics when ``metrics_interval`` is set."""
+        if not self.metrics_interval:
+            return
+        while True:
+            await asyncio.sleep(self.metrics_interval)
+            self.info("Pipeline metrics", "PipelineServer", metrics=self.get_metrics())
 
     async def consumer(self):
-        """Processes data from trigger queue asynchronously."""
+        """Runs the trigger workers of every pipeline."""
+        workers = []
+        for i, pipeline in enumerate(self.pipelines):
+            max_in_flight = self.get_trigger_queue_config(pipeline)["max_in_flight"]
+            workers.extend(self.trigger_worker(i) for _ in range(max_in_flight))
+        await asyncio.gather(*workers)
+
+    async def trigger_worker(self, pipeline_index):
+        """Drains the trigger queue of a single pipeline."""
+        queue = self.trigger_queues[pipeline_index]
         while True:
-            data = await self.data_queue.get()
-            asyncio.create_task(self.process_data(data))
+            data = await queue.get()
+            self.in_flight[pipeline_index] += 1
+            start_time = time.perf_counter()
+            try:
+                await self.process_data(data)
+            except Exception as e:
+                pipeline = self.pipelines[pipeline_index]
+                self.error(f"Trigger processing failed: {e}\n{traceback.format_exc()}", pipeline.name)
+            finally:
+                self.in_flight[pipeline_index] -= 1
+                self.record_service_time(pipeline_index, time.perf_counter() - start_time)
+
+    def record_service_time(self, pipeline_index, duration, smoothing=0.3):
+        """Updates the exponentially smoothed trigger service time of a pipeline."""
+        previous = self.service_times[pipeline_index]
+        self.service_times[pipeline_index] = duration if previous == 0 else (
+            smoothing * duration + (1 - smoothing) * previous
+        )
 
     async def process_data(self, data):
         """Processes trigger data and pushes pipeline output."""
         pipeline = self.pipelines[data['pipeline_index']]
-        decoded = pipeline.decode_stream_data(data['sid'], data['buffer'])
+        decoded = self.decode_stream_data(
+            pipeline, data['sid'], data['buffer'], data['decoded_cache'], data['entry_id']
+        )
         # generate a random str to test
         result = await pipeline.on_trigger_stream(decoded)
         if result is None:
@@ -117,8 +338,40 @@ class PipelineServer:
             encoded_list.append(pipeline.encode_stream_data(out_stream.sid, out_data))
             # print("server-side:", pipeline.get_server_side_stream_id(out_stream.sid))
 
+        # Partial results must not land after the final one.
+        await self.wait_pending_emits(output_sids)
         await self.connect_with_retries(output_sids, encoded_list, result)
 
+    async def emit_output(self, pipeline, sid, data):
+        """
+        Encodes and pushes data to one output stream of a pipeline in the background.
+
+        Emitted data is a partial result that is soon superseded, so it is
+        posted once without retries, and dropped while the previous post to
+        the same stream is still pending.
+
+        Returns:
+            bool: Whether the data was posted.
+        """
+        server_sid = pipeline.get_server_side_stream_id(sid)
+        pending = self.pending_emits.get(server_sid)
+        if pending is not None and not pending.done():
+            return False
+        task = asyncio.ensure_future(self.send_request([server_sid], [pipeline.encode_stream_data(sid, data)]))
+        self.pending_emits[server_sid] = task
+        task.add_done_callback(lambda _: self.forget_emit(server_sid, task))
+        return True
+
+    def forget_emit(self, sid, task):
+        if self.pending_emits.get(sid) is task:
+            del self.pending_emits[sid]
+
+    async def wait_pending_emits(self, sids):
+        """Waits for the pending background posts to the given streams."""
+        pending = [self.pending_emits[sid] for sid in sids if sid in self.pending_emits]
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
     async def connect_with_retries(self, sids, encoded_list, result, retries=3, delay=2):
         """Retries connection to push output data with exponential backoff."""
         for attempt in range(retries):
@@ -133,28 +386,75 @@ class PipelineServer:
             delay *= 2
         self.warning("All retry attempts failed.", "connect_with_retries")
 
+    def get_http_client(self):
+        """Returns the pooled HTTP client used for output posting, creating it on first use."""
+        if self.http_client is None:
+            self.http_client = httpx.AsyncClient(
+                headers=self.headers,
+                timeout=httpx.Timeout(30.0, connect=10.0),
+                limits=httpx.Limits(**self.DEFAULT_HTTP_LIMITS),
+            )
+        return self.http_client
+
+    async def close(self):
+        """Releases the pooled HTTP connections, including the shared LLM client."""
+        if self.http_client is not None:
+            await self.http_client.aclose()
+            self.http_client = None
+        await close_llm_client()
+
     async def send_request(self, sids, buffers):
         """Sends output stream data to ptgctl server."""
-        for sid, buf in zip(sids, buffers):
+        if not sids:
+            return
+        client = self.get_http_client()
+        if self.batch_upload and len(sids) > 1:
             try:
-                async with httpx.AsyncClient() as client:
-                    await client.post(f"{self.url}/data/{sid}", files={'entries': buf}, headers=self.headers)
+                await self.send_batch_request(client, sids, buffers)
+                return
+            except httpx.HTTPStatusError as e:
+                if 400 <= e.response.status_code < 500:
+                    # Older ptgctl servers reject multi-stream uploads; stop trying.
+                    self.batch_upload = False
+                    self.warning(f"Batch upload rejected, falling back to per-stream posting: {e}", "send_request")
+                else:
+                    self.debug(f"Batch upload failed, posting per stream: {e}", "send_request")
             except Exception as e:
-                self.debug(f"HTTP send failed: {e} {sid} {self.url}\n {traceback.format_exc()}", "send_request")
+                # Transient (timeout, connection reset): post this batch per stream only.
+                self.debug(f"Batch upload failed, posting per stream: {e}", "send_request")
+        await asyncio.gather(*(
+            self.send_stream_request(client, sid, buf) for sid, buf in zip(sids, buffers)
+        ))
 
-    def start_process_manager(self):
-        """Starts background trigger process via REST."""
-        if not self.trigger_streams:
-            self.warning("No trigger stream set.", "ProcessManager")
-            return
-        signal.signal(signal.SIGINT, self.process_manager.signal_handler)
-        for trigger_stream in self.trigger_streams:
-            self.process_manager.start_process(f"{self.url}/data/{trigger_stream}", self.trigger_streams[trigger_stream]['interval'])
+    async def send_stream_request(self, client, sid, buf):
+        """Posts one output entry to a single stream."""
+        try:
+            await client.post(f"{self.url}/data/{sid}", files={'entries': as_upload(buf)})
+        except Exception as e:
+            self.debug(f"HTTP send failed: {e} {sid} {self.url}\n {traceback.format_exc()}", "send_request")
+
+    async def send_batch_request(self, client, sids, buffers):
+        """Posts entries for several streams in a single multi-stream upload."""
+        response = await client.post(
+            f"{self.url}/data/{'+'.join(sids)}",
+            files=[('entries', as_upload(buf)) for buf in buffers],
+        )
+        response.raise_for_status()
 
     async def start(self):
-        """Starts the pipeline server (producer + consumer)."""
-        self.start_process_manager()
-        await asyncio.gather(self.producer(), self.consumer())
+        """Starts the pipeline server (producer, trigger scheduler, input and trigger workers)."""
+        self.build_trigger_queues()
+        self.build_input_mailboxes()
+        self.input_index, self.trigger_index = self.build_pipeline_stream_index()
+        if not self.trigger_scheduler.triggers:
+            self.warning("No trigger stream set.", "TriggerScheduler")
+        try:
+            await asyncio.gather(
+                self.producer(), self.input_dispatcher(), self.consumer(),
+                self.trigger_scheduler.run(), self.metrics_reporter()
+            )
+        finally:
+            await self.close()
 
     # Logging wrappers
     def debug(self, message, sender, **extra):
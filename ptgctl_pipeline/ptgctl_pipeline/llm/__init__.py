@@ -0,0 +1,44 @@
+from .client import (
+    LLMClient,
+    ProviderConfig,
+    get_llm_client,
+    configure_llm_client,
+    close_llm_client,
+)
+from .providers import (
+    openai_headers,
+    anthropic_headers,
+    openai_chat_completion,
+    openai_chat_completion_stream,
+    openai_image_generation,
+    anthropic_messages,
+)
+from .prompt_cache import (
+    PromptPrefix,
+    PromptPrefixCache,
+    anthropic_system_blocks,
+)
+from .response_cache import (
+    ResponseCache,
+    hash_prompt,
+)
+
+
+__all__ = [
+    "LLMClient",
+    "ProviderConfig",
+    "get_llm_client",
+    "configure_llm_client",
+    "close_llm_client",
+    "openai_headers",
+    "anthropic_headers",
+    "openai_chat_completion",
+    "openai_chat_completion_stream",
+    "openai_image_generation",
+    "anthropic_messages",
+    "PromptPrefix",
+    "PromptPrefixCache",
+    "anthropic_system_blocks",
+    "ResponseCache",
+    "hash_prompt",
+]
@@ -0,0 +1,224 @@
+import random
+import asyncio
+import contextlib
+import importlib.util
+from dataclasses import dataclass, replace
+
+import httpx
+
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+RETRY_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504, 529}
+
+
+@dataclass
+class ProviderConfig:
+    """
+    Connection policy of one LLM provider.
+
+    Attributes:
+        base_url (str): Prefix of relative request paths.
+        max_concurrency (int): Maximum number of concurrent requests.
+        timeout (float): Total request timeout in seconds.
+        connect_timeout (float): Connection timeout in seconds.
+        max_retries (int): Retries after a transport error or retryable status.
+        backoff (float): Base delay of the exponential retry backoff in seconds.
+        max_retry_after (float): Upper bound in seconds of a ``Retry-After`` delay.
+    """
+    base_url: str = ""
+    max_concurrency: int = 8
+    timeout: float = 60.0
+    connect_timeout: float = 10.0
+    max_retries: int = 2
+    backoff: float = 0.5
+    max_retry_after: float = 30.0
+
+
+DEFAULT_PROVIDERS = {
+    "openai": ProviderConfig("https://api.openai.com/v1", max_concurrency=8),
+    "anthropic": ProviderConfig("https://api.anthropic.com/v1", max_concurrency=4),
+    # Plain downloads, e.g. generated images.
+    "download": ProviderConfig(max_concurrency=16, timeout=30.0),
+}
+
+
+class LLMClient:
+    """
+    Shared async HTTP client for LLM provider APIs.
+
+    All pipelines share one pooled ``httpx.AsyncClient`` (HTTP/2 when the
+    ``h2`` package is installed), so requests to the same provider reuse
+    connections instead of paying a TLS handshake per call. Each provider has
+    its own concurrency limit, timeouts and retry policy: transport errors and
+    retryable status codes (429, 5xx) are retried with jittered exponential
+    backoff, honouring ``Retry-After`` up to ``max_retry_after``. A request
+    only holds its concurrency slot while an attempt is on the wire, not
+    while it waits to retry.
+
+    Args:
+        providers (dict[str, ProviderConfig]): Provider policies, by name.
+        limits (httpx.Limits): Connection pool limits.
+    """
+
+    DEFAULT_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=60.0)
+
+    def __init__(self, providers=None, limits=None):
+        self.providers = dict(DEFAULT_PROVIDERS)
+        self.providers.update(providers or {})
+        self.limits = limits or self.DEFAULT_LIMITS
+        self.http_client = None
+        self.semaphores = {}
+
+    def configure(self, config):
+        """
+        Update provider policies from a config mapping.
+
+        Args:
+            config (dict): Provider name to a dict of ``ProviderConfig`` fields.
+        """
+        for name, fields in (config or {}).items():
+            self.providers[name] = replace(self.get_provider(name), **fields)
+            self.semaphores.pop(name, None)
+
+    def get_provider(self, name):
+        return self.providers.get(name) or ProviderConfig()
+
+    def get_http_client(self):
+        """Returns the pooled HTTP client, creating it on first use."""
+        if self.http_client is None:
+            self.http_client = httpx.AsyncClient(limits=self.limits, http2=HTTP2_AVAILABLE)
+        return self.http_client
+
+    def get_semaphore(self, name):
+        if name not in self.semaphores:
+            self.semaphores[name] = asyncio.Semaphore(self.get_provider(name).max_concurrency)
+        return self.semaphores[name]
+
+    async def request(self, provider, method, url, **kwargs):
+        """
+        Sends a request through the provider's concurrency limit and retry policy.
+
+        Args:
+            provider (str): Provider name.
+            method (str): HTTP method.
+            url (str): Absolute URL, or path relative to the provider's ``base_url``.
+            **kwargs: Passed to ``httpx.AsyncClient.request``.
+
+        Returns:
+            httpx.Response: The successful response.
+
+        Raises:
+            httpx.HTTPError: When the request still fails after all retries.
+        """
+        config, url = self.resolve(provider, url, kwargs)
+        client = self.get_http_client()
+        for attempt in range(config.max_retries + 1):
+            async with self.get_semaphore(provider):
+                try:
+                    response = await client.request(method, url, **kwargs)
+                    if response.status_code not in RETRY_STATUS_CODES or attempt == config.max_retries:
+                        response.raise_for_status()
+                        return response
+                    delay = self.get_retry_delay(config, attempt, response)
+                except httpx.TransportError:
+                    if attempt == config.max_retries:
+                        raise
+                    delay = self.get_retry_delay(config, attempt)
+            await asyncio.sleep(delay)
+
+    @contextlib.asynccontextmanager
+    async def stream(self, provider, method, url, **kwargs):
+        """
+        Sends a request and yields the response before its body is read.
+
+        Used for server-sent events. Retries only happen before the response
+        body starts; the provider's concurrency slot is released while waiting
+        to retry, and held from the successful attempt until the context exits.
+
+        Args:
+            provider (str): Provider name.
+            method (str): HTTP method.
+            url (str): Absolute URL, or path relative to the provider's ``base_url``.
+            **kwargs: Passed to ``httpx.AsyncClient.build_request``.
+
+        Yields:
+            httpx.Response: The streaming response.
+        """
+        config, url = self.resolve(provider, url, kwargs)
+        client = self.get_http_client()
+        for attempt in range(config.max_retries + 1):
+            async with self.get_semaphore(provider):
+                try:
+                    response = await client.send(client.build_request(method, url, **kwargs), stream=True)
+                except httpx.TransportError:
+                    if attempt == config.max_retries:
+                        raise
+                    delay = self.get_retry_delay(config, attempt)
+                else:
+                    if response.status_code in RETRY_STATUS_CODES and attempt < config.max_retries:
+                        await response.aclose()
+                        delay = self.get_retry_delay(config, attempt, response)
+                    else:
+                        try:
+                            response.raise_for_status()
+                            yield response
+                        finally:
+                            await response.aclose()
+                        return
+            await asyncio.sleep(delay)
+
+    def resolve(self, provider, url, kwargs):
+        """Resolves the provider policy and URL, and applies its default timeout."""
+        config = self.get_provider(provider)
+        if not url.startswith(("http://", "https://")):
+            url = config.base_url.rstrip("/") + "/" + url.lstrip("/")
+        kwargs.setdefault("timeout", httpx.Timeout(config.timeout, connect=config.connect_timeout))
+        return config, url
+
+    @staticmethod
+    def get_retry_delay(config, attempt, response=None):
+        if response is not None:
+            try:
+                return min(max(float(response.headers["retry-after"]), 0.0), config.max_retry_after)
+            except (KeyError, ValueError):
+                pass
+        return config.backoff * (2 ** attempt) * (0.5 + random.random())
+
+    async def post_json(self, provider, url, payload, headers=None):
+        """Posts a JSON payload and returns the decoded JSON response."""
+        response = await self.request(provider, "POST", url, json=payload, headers=headers)
+        return response.json()
+
+    async def download(self, url):
+        """Downloads a resource and returns its content."""
+        response = await self.request("download", "GET", url)
+        return response.content
+
+    async def aclose(self):
+        """Releases the pooled connections."""
+        if self.http_client is not None:
+            await self.http_client.aclose()
+            self.http_client = None
+
+
+_llm_client = None
+
+
+def get_llm_client():
+    """Returns the process-wide shared LLMClient."""
+    global _llm_client
+    if _llm_client is None:
+        _llm_client = LLMClient()
+    return _llm_client
+
+
+def configure_llm_client(config):
+    """Updates the provider policies of the shared LLMClient."""
+    get_llm_client().configure(config)
+
+
+async def close_llm_client():
+    """Closes the shared LLMClient, if it was created."""
+    if _llm_client is not None:
+        await _llm_client.aclose()
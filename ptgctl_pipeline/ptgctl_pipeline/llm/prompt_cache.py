@@ -0,0 +1,82 @@
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class PromptPrefix:
+    """
+    Static, cacheable leading part of a prompt.
+
+    Attributes:
+        text (str): Prefix text, sent before any per-call content.
+        cache_key (str): Stable digest of ``text``, used to route requests
+            with the same prefix to the same provider-side prompt cache.
+    """
+    text: str
+    cache_key: str
+
+    @classmethod
+    def from_text(cls, text):
+        return cls(text, hashlib.sha256(text.encode("utf-8")).hexdigest()[:16])
+
+
+class PromptPrefixCache:
+    """
+    LRU cache of assembled prompt prefixes.
+
+    Providers cache prompts by exact prefix match, so the static part of a
+    prompt (system prompt, task description, output schema) must be
+    byte-identical across calls and come before anything that changes per
+    call. Building it once per key, e.g. per task plan, guarantees that and
+    avoids re-assembling large templates on every trigger.
+
+    Args:
+        maxsize (int): Maximum number of prefixes kept.
+    """
+
+    def __init__(self, maxsize=16):
+        self.maxsize = maxsize
+        self.prefixes = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, build):
+        """
+        Returns the prefix for ``key``, building it on a miss.
+
+        Args:
+            key (Hashable): Identifies the static prompt content.
+            build (Callable[[], str]): Builds the prefix text.
+
+        Returns:
+            PromptPrefix: The cached prefix.
+        """
+        prefix = self.prefixes.get(key)
+        if prefix is not None:
+            self.prefixes.move_to_end(key)
+            self.hits += 1
+            return prefix
+        self.misses += 1
+        prefix = self.prefixes[key] = PromptPrefix.from_text(build())
+        if len(self.prefixes) > self.maxsize:
+            self.prefixes.popitem(last=False)
+        return prefix
+
+    def clear(self):
+        self.prefixes.clear()
+
+    def stats(self):
+        """Returns hit/miss counters and the current size."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.prefixes),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def anthropic_system_blocks(system_prompt):
+    """Wraps a static system prompt in a block marked for Anthropic prompt caching."""
+    return [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}]
@@ -0,0 +1,90 @@
+import json
+
+from .client import get_llm_client
+
+
+ANTHROPIC_VERSION = "2023-06-01"
+
+
+def openai_headers(api_key):
+    return {
+        "Content-Type": "application/json",
+        "Authorization": f"Bearer {api_key}"
+    }
+
+
+def anthropic_headers(api_key):
+    return {
+        "content-type": "application/json",
+        "x-api-key": api_key,
+        "anthropic-version": ANTHROPIC_VERSION,
+    }
+
+
+async def openai_chat_completion(payload, api_key):
+    """
+    Calls the OpenAI chat completions API through the shared LLM client.
+
+    Args:
+        payload (dict): Request body.
+        api_key (str): OpenAI API key.
+
+    Returns:
+        dict: Decoded JSON response.
+    """
+    return await get_llm_client().post_json("openai", "chat/completions", payload, openai_headers(api_key))
+
+
+async def openai_chat_completion_stream(payload, api_key):
+    """
+    Streams an OpenAI chat completion as server-sent events.
+
+    Args:
+        payload (dict): Request body; ``stream`` is set automatically.
+        api_key (str): OpenAI API key.
+
+    Yields:
+        str: Content deltas of the first choice, in order.
+    """
+    payload = {**payload, "stream": True}
+    client = get_llm_client()
+    async with client.stream("openai", "POST", "chat/completions", json=payload,
+                             headers=openai_headers(api_key)) as response:
+        async for line in response.aiter_lines():
+            if not line.startswith("data:"):
+                continue
+            data = line[len("data:"):].strip()
+            if data == "[DONE]":
+                break
+            for choice in json.loads(data).get("choices", []):
+                delta = (choice.get("delta") or {}).get("content")
+                if delta and choice.get("index", 0) == 0:
+                    yield delta
+
+
+async def openai_image_generation(payload, api_key):
+    """
+    Calls the OpenAI image generation API through the shared LLM client.
+
+    Args:
+        payload (dict): Request body.
+        api_key (str): OpenAI API key.
+
+    Returns:
+        dict: Decoded JSON response.
+    """
+    return await get_llm_client().post_json("openai", "images/generations", payload, openai_headers(api_key))
+
+
+async def anthropic_messages(payload, api_key):
+    """
+    Calls the Anthropic messages API through the shared LLM client.
+
+    Args:
+        payload (dict): Request body.
+        api_key (str): Anthropic API key.
+
+    Returns:
+        dict: Decoded JSON response.
+    """
+    return await get_llm_client().post_json("anthropic", "messages", payload, anthropic_headers(api_key))
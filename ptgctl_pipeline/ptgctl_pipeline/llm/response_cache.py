@@ -0,0 +1,116 @@
+import time
+import hashlib
+import itertools
+from collections import OrderedDict
+from dataclasses import dataclass
+
+
+def hash_prompt(*parts):
+    """Returns a short stable digest of the given prompt parts."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+
+@dataclass
+class CacheEntry:
+    key: tuple
+    embedding: object
+    value: object
+    created: float
+
+
+class ResponseCache:
+    """
+    Semantic cache of model responses.
+
+    Responses are stored under an exact key, e.g. (prompt hash, step), along
+    with a compact embedding of the input image. A lookup hits when an entry
+    under the same key is younger than ``ttl`` and its embedding's cosine
+    similarity to the query embedding is at least ``similarity_threshold``,
+    so a user lingering on a step gets the previous answer instead of a new
+    model call. The least recently used entries are evicted beyond
+    ``maxsize``.
+
+    Args:
+        maxsize (int): Maximum number of entries.
+        ttl (float): Entry lifetime in seconds.
+        similarity_threshold (float): Minimum cosine similarity of a hit.
+        clock (Callable[[], float]): Time source, in seconds.
+    """
+
+    def __init__(self, maxsize=128, ttl=60.0, similarity_threshold=0.95, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.similarity_threshold = similarity_threshold
+        self.clock = clock
+        self.entries = OrderedDict()
+        self.buckets = {}
+        self.ids = itertools.count()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    def get(self, key, embedding):
+        """
+        Looks up the most similar live response stored under ``key``.
+
+        Args:
+            key (Hashable): Exact part of the request identity.
+            embedding (np.ndarray): Unit-norm image embedding.
+
+        Returns:
+            The cached response, or None on a miss.
+        """
+        now = self.clock()
+        best_id, best_similarity = None, self.similarity_threshold
+        for entry_id in list(self.buckets.get(key, ())):
+            entry = self.entries[entry_id]
+            if now - entry.created > self.ttl:
+                self.expired += 1
+                self.remove(entry_id)
+                continue
+            similarity = float(entry.embedding @ embedding)
+            if similarity >= best_similarity:
+                best_id, best_similarity = entry_id, similarity
+        if best_id is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(best_id)
+        return self.entries[best_id].value
+
+    def put(self, key, embedding, value):
+        """Stores a response, evicting the least recently used entries if full."""
+        entry_id = next(self.ids)
+        self.entries[entry_id] = CacheEntry(key, embedding, value, self.clock())
+        self.buckets.setdefault(key, set()).add(entry_id)
+        while len(self.entries) > self.maxsize:
+            self.evictions += 1
+            self.remove(next(iter(self.entries)))
+
+    def remove(self, entry_id):
+        entry = self.entries.pop(entry_id)
+        bucket = self.buckets[entry.key]
+        bucket.discard(entry_id)
+        if not bucket:
+            del self.buckets[entry.key]
+
+    def clear(self):
+        self.entries.clear()
+        self.buckets.clear()
+
+    def stats(self):
+        """Returns hit/miss counters and the current size."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "expired": self.expired,
+            "evictions": self.evictions,
+        }
@@ -1,6 +1,6 @@
 from .logger import Logger
 from .types import TimeFormatter, LogLevel
-from .handlers import LogHandler, ConsoleLogHandler, FileLogHandler, JSONLogHandler
+from .handlers import LogHandler, ConsoleLogHandler, FileLogHandler, JSONLogHandler, JSONLinesLogHandler
 
 __all__ = [
     "Logger",
@@ -10,4 +10,5 @@ __all__ = [
     "ConsoleLogHandler",
     "FileLogHandler",
     "JSONLogHandler",
+    "JSONLinesLogHandler",
 ]
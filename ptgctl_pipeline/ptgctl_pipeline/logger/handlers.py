@@ -7,11 +7,19 @@ from .types import TimeFormatter, LogLevel, LogMessage
 class LogHandler:
     """
     Abstract base class for all log handlers.
-    Subclasses must implement the `emit` method.
+    Subclasses must implement the `emit` method. Handlers that buffer output
+    override `flush` and `close`.
     """
     def emit(self, log_message: LogMessage):
         raise NotImplementedError("Subclasses must implement emit method")
 
+    def flush(self):
+        """Write any buffered output."""
+
+    def close(self):
+        """Flush and release resources held by the handler."""
+        self.flush()
+
 
 class ConsoleLogHandler(LogHandler):
     """
@@ -28,21 +36,38 @@ class ConsoleLogHandler(LogHandler):
 class FileLogHandler(LogHandler):
     """
     Logs messages to a plain text file.
+
+    The file is opened once in append mode and written through a buffer;
+    output reaches the disk on `flush`.
     """
-    def __init__(self, filename: str, time_formatter: TimeFormatter):
+    def __init__(self, filename: str, time_formatter: TimeFormatter, buffer_size: int = 64 * 1024):
         self.filename = filename
         self.time_formatter = time_formatter
+        self.fp = open(self.filename, 'a', buffering=buffer_size)
 
     def emit(self, log_message: LogMessage):
         formatted_time = self.time_formatter.format(log_message.timestamp)
         formatted_message = f"{formatted_time} - {log_message.level.name} - {log_message.message}"
-        with open(self.filename, 'a') as f:
-            f.write(formatted_message + '\n')
+        if self.fp.closed:
+            return
+        self.fp.write(formatted_message + '\n')
+
+    def flush(self):
+        if not self.fp.closed:
+            self.fp.flush()
+
+    def close(self):
+        if not self.fp.closed:
+            self.fp.close()
 
 
 class JSONLogHandler(LogHandler):
     """
     Logs messages to a JSON file, appending new messages as structured entries.
+
+    The whole file is rewritten on every message, so the cost of logging grows
+    with the session length. Prefer `JSONLinesLogHandler` for long-running
+    servers.
     """
     def __init__(self, filename_prefix: str, log_dir: str = "./logs"):
         os.makedirs(log_dir, exist_ok=True)
@@ -56,3 +81,65 @@ class JSONLogHandler(LogHandler):
         self.messages.append(log_message.to_dict())
         with open(self.filename, "w") as fp:
             json.dump({"messages": self.messages}, fp, indent=2)
+
+
+class JSONLinesLogHandler(LogHandler):
+    """
+    Logs messages to an append-only JSON Lines file, one object per line.
+
+    Writes go through a buffer and reach the disk on `flush`, which the
+    logger calls periodically. When the current file grows beyond
+    ``max_bytes`` it is closed and logging continues in a new numbered file
+    (``<prefix>_<time>.1.jsonl``, ``.2.jsonl``, ...); no file is ever
+    rewritten.
+
+    Args:
+        filename_prefix (str): Prefix of the log file names.
+        log_dir (str): Directory the log files are written to.
+        max_bytes (int): Size after which the file is rotated; 0 disables rotation.
+        buffer_size (int): Size of the write buffer in bytes.
+    """
+    def __init__(self, filename_prefix: str, log_dir: str = "./logs", max_bytes: int = 64 * 1024 * 1024,
+                 buffer_size: int = 64 * 1024):
+        os.makedirs(log_dir, exist_ok=True)
+        timestamp_str = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        self.basename = os.path.join(log_dir, f"{filename_prefix}_{timestamp_str}")
+        self.max_bytes = max_bytes
+        self.buffer_size = buffer_size
+        self.part = 0
+        self.fp = None
+        self.open()
+
+    @property
+    def filename(self):
+        if self.part:
+            return f"{self.basename}.{self.part}.jsonl"
+        return f"{self.basename}.jsonl"
+
+    def open(self):
+        self.fp = open(self.filename, "a", encoding="utf-8", buffering=self.buffer_size)
+        self.size = self.fp.tell()
+
+    def rotate(self):
+        """Close the current file and continue in the next numbered one."""
+        self.fp.close()
+        self.part += 1
+        self.open()
+
+    def emit(self, log_message: LogMessage):
+        if self.fp.closed:
+            return
+        line = json.dumps(log_message.to_dict(), default=str) + "\n"
+        nbytes = len(line.encode("utf-8"))
+        if self.max_bytes and self.size and self.size + nbytes > self.max_bytes:
+            self.rotate()
+        self.fp.write(line)
+        self.size += nbytes
+
+    def flush(self):
+        if not self.fp.closed:
+            self.fp.flush()
+
+    def close(self):
+        if not self.fp.closed:
+            self.fp.close()
@@ -1,3 +1,9 @@
+import sys
+import time
+import queue
+import atexit
+import threading
+import traceback
 from typing import List
 from .types import TimeFormatter, LogLevel, LogMessage
 from .handlers import LogHandler, ConsoleLogHandler, FileLogHandler, JSONLogHandler
@@ -9,11 +15,26 @@ class Logger:
 
     Supports structured logging with metadata, level filtering, and dispatching
     to console, file, or JSON-based outputs.
+
+    Log calls never perform I/O: messages are put on a bounded queue and
+    dispatched to the handlers by a background thread, which also flushes
+    buffered handlers every ``flush_interval`` seconds. When the queue is
+    full, new messages are dropped and counted in ``dropped``.
+
+    Args:
+        max_queue (int): Maximum number of messages waiting to be dispatched.
+        flush_interval (float): Seconds between handler flushes.
     """
 
-    def __init__(self):
+    def __init__(self, max_queue: int = 10000, flush_interval: float = 1.0):
         self.handlers: List[LogHandler] = []
         self.min_level = LogLevel.DEBUG  # Default log level
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.thread = None
+        self.closed = False
+        self.lock = threading.Lock()
 
     def add_handler(self, handler: LogHandler) -> 'Logger':
         """
@@ -41,7 +62,7 @@ class Logger:
 
     def log(self, level: LogLevel, message: str, sender: str, **extra):
         """
-        Emit a log message if it meets the minimum severity.
+        Queue a log message if it meets the minimum severity.
 
         Args:
             level (LogLevel): Severity level
@@ -49,10 +70,76 @@ class Logger:
             sender (str): Name of the component or module emitting the log
             extra (dict): Additional metadata
         """
-        if level.value >= self.min_level.value:
-            log_message = LogMessage(level, message, sender, extra=extra)
-            for handler in self.handlers:
+        if level.value < self.min_level.value:
+            return
+        log_message = LogMessage(level, message, sender, extra=extra)
+        if self.closed:
+            self.dispatch(log_message)
+            return
+        self.start()
+        try:
+            self.queue.put_nowait(log_message)
+        except queue.Full:
+            self.dropped += 1
+
+    def start(self):
+        """Start the dispatch thread if it is not running."""
+        if self.thread is not None:
+            return
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name="logger", daemon=True)
+                self.thread.start()
+                atexit.register(self.close)
+
+    def run(self):
+        """Dispatch queued messages until `close` is called."""
+        last_flush = time.monotonic()
+        while True:
+            try:
+                log_message = self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                log_message = False
+            if log_message is None:
+                break
+            if log_message:
+                self.dispatch(log_message)
+            if time.monotonic() - last_flush >= self.flush_interval:
+                self.flush()
+                last_flush = time.monotonic()
+        self.flush()
+
+    def dispatch(self, log_message: LogMessage):
+        for handler in self.handlers:
+            try:
                 handler.emit(log_message)
+            except Exception:
+                traceback.print_exc(file=sys.stderr)
+
+    def flush(self):
+        """Flush all handlers."""
+        for handler in self.handlers:
+            try:
+                handler.flush()
+            except Exception:
+                traceback.print_exc(file=sys.stderr)
+
+    def close(self):
+        """
+        Dispatch pending messages, stop the background thread and close all
+        handlers. Messages logged afterwards are emitted synchronously.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+        for handler in self.handlers:
+            try:
+                handler.close()
+            except Exception:
+                traceback.print_exc(file=sys.stderr)
 
     # Convenience wrappers for common log levels
     def debug(self, message: str, sender: str, **extra):
@@ -20,6 +20,12 @@ class BasePipeline:
 
         self.stream_map = stream_map
 
+        # Per-pipeline overrides of the server's trigger queue settings
+        # (maxsize, overflow, max_in_flight) and input mailbox settings
+        # (maxsize, overflow); empty means server defaults.
+        self.trigger_queue_config = {}
+        self.input_mailbox_config = {}
+
         # Initialize streams
         self.input_streams = []
         self.trigger_streams = []
@@ -155,8 +161,20 @@ class BasePipeline:
         decoded = self.decode_stream_data(self.trigger_streams[0].sid, message)
         await self.on_trigger_stream(decoded)
 
-    def decode_stream_data(self, sid, data):
-        return self.sid_index[sid].codec.decode(data)
+    def decode_stream_data(self, sid, data, entry_id=None):
+        return self.sid_index[sid].codec.decode_entry(data, entry_id)
+
+    def is_readonly_stream(self, sid):
+        return self.sid_index[sid].readonly
+
+    def is_coalesced_stream(self, sid):
+        return self.sid_index[sid].coalesce
+
+    def get_stream_codec(self, sid):
+        return self.sid_index[sid].codec
+
+    def get_stream_resolutions(self, sid):
+        return self.sid_index[sid].resolutions
 
     def encode_stream_data(self, sid, data):
         return self.sid_index[sid].codec.encode(data)
@@ -165,12 +183,29 @@ class BasePipeline:
         encoded = self.encode_stream_data(sid, data)
         return encoded  # Placeholder for actual stream write logic
 
+    async def emit(self, sid, data):
+        """
+        Publishes data to an output stream before the current handler returns.
+
+        Used for partial results; the handler's return value is still
+        published as usual, after any pending partial result. Partial results
+        are posted in the background and dropped while the previous one is
+        still being posted. Does nothing if the pipeline is not registered.
+        """
+        if self.context is None:
+            return
+        await self.context.emit_output(self, sid, data)
+
     def on_registering_pipeline(self, context):
         self.context = context
 
     def get_context(self):
         return self.context
 
+    def get_metrics(self):
+        """Returns pipeline-specific statistics, e.g. cache counters, reported with the server metrics."""
+        return {}
+
     # Logging
     def _log(self, level, *messages, **extra):
         if self.context is None:
@@ -1,36 +1,28 @@
+import os
 import time
 import base64
-import requests
 import cv2
 import numpy as np
 from ..base import BasePipeline
+from ...llm import anthropic_messages, anthropic_system_blocks
 
 
 # ----------------------
 # API Configuration
 # ----------------------
-ANTHROPIC_API_KEY = ""  # Move to secure config in production
+ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY", "")
 
 
 def bytes_to_base64(image_bytes):
     return base64.b64encode(image_bytes).decode("utf-8")
 
 
-def assemble_headers():
-    return {
-        "content-type": "application/json",
-        "x-api-key": ANTHROPIC_API_KEY,
-        "anthropic-version": "2023-06-01",
-        "anthropic-beta": "messages-2023-12-15"
-    }
-
-
 def assemble_claude_request(image_bytes, system_prompt, prompt_text):
     image_base64 = bytes_to_base64(image_bytes)
     return {
         "model": "claude-3-opus-20240229",
         "max_tokens": 1024,
-        "system": system_prompt,
+        "system": anthropic_system_blocks(system_prompt),
         "messages": [
             {
                 "role": "user",
@@ -43,12 +35,10 @@ def assemble_claude_request(image_bytes, system_prompt, prompt_text):
     }
 
 
-def query_claude(image_bytes, system_prompt, prompt_text):
+async def query_claude(image_bytes, system_prompt, prompt_text):
     start = time.time()
     payload = assemble_claude_request(image_bytes, system_prompt, prompt_text)
-    headers = assemble_headers()
-    response = requests.post("https://api.anthropic.com/v1/messages", headers=headers, json=payload)
-    result = response.json()
+    result = await anthropic_messages(payload, ANTHROPIC_API_KEY)
     print("[Claude3] Time taken:", time.time() - start)
     return result["content"][0]["text"]
 
@@ -87,17 +77,17 @@ class Claude3Pipeline(BasePipeline):
     async def on_trigger_stream(self, message):
         self.enabled = True
         if self.concat_image_set:
-            result = self.fetch_gpt_response(self.concat_image)
+            result = await self.fetch_gpt_response(self.concat_image)
             self.enabled = False
             if self.postprocess:
                 result = self.postprocess(result)
             return result
         self.enabled = False
 
-    def fetch_gpt_response(self, long_picture):
+    async def fetch_gpt_response(self, long_picture):
         try:
             image_bytes = cv2.imencode(".jpeg", long_picture)[1].tobytes()
-            response = query_claude(image_bytes, self.system_prompt, self.system_prompt)
+            response = await query_claude(image_bytes, self.system_prompt, self.system_prompt)
             result, thoughts = self.parse_result(response)
             return {"success": True, "response": response, "thoughts": thoughts, "result": result}
         except Exception as e:
@@ -12,34 +12,52 @@ from ...config import read_config
 from ...pipeline.base import BasePipeline
 from ...codec import JsonCodec, HoloframeCodec, BytesCodec
 from ...stream import StreamConfig
+from ...utils.ring_buffer import FrameRingBuffer
+from ...utils.concat_strip import ConcatStripBuilder
+from ...utils.pyramid import get_frame_image
 
 
 class FramePipeline(BasePipeline):
     """
     A pipeline for buffering and concatenating image frames for downstream processing.
 
+    Sampled frames are kept in a fixed-capacity ring buffer, so the frame
+    history of long-running pipelines stays bounded. Concatenated images are
+    maintained incrementally per requested resize ratio: each frame is
+    downscaled once into a preallocated strip (see ``ConcatStripBuilder``).
+    Frame conversions and resizes are read from the frame's shared pyramid,
+    so pipelines subscribed to the same frames compute them only once.
+
     Attributes:
-        buffer_limit (int): Max number of frames to hold before concatenation
+        buffer_limit (int): Number of latest frames concatenated together
         dropout (int): Frame skipping interval (e.g., every 10th frame)
         image_stream_name (str): Stream name to match image source
+        frame_history (FrameRingBuffer): The latest sampled RGB frames;
+            by default just the ``buffer_limit`` frames the strips are seeded from
+        CONCAT_RESIZE_RATIO (float): Default resize ratio of the concatenated
+            image, declared as a resolution of the image stream
     """
 
+    CONCAT_RESIZE_RATIO = 0.3
+
     def __init__(self, 
                  stream_map = {},
-                 buffer_limit=3, downsample_rate=3, postprocess=None, image_stream_name="main"):
+                 buffer_limit=3, downsample_rate=3, postprocess=None, image_stream_name="main",
+                 history_size=None, history_bytes=None):
         super().__init__(stream_map=stream_map)
-        self.concat_image = None
         self.concat_image_set = False
-        self.buffer = []
-        self.stored_frames = []
+        self.concat_builders = {}
         self.buffer_limit = buffer_limit
+        self.set_frame_history(history_size, history_bytes)
         self.downsample_rate = downsample_rate
         self.index = 0
         self.enabled = False
         self.busy = False
+        self.latest_wins = False
         self.image_stream_name = image_stream_name
         self.add_input_stream(
-            StreamConfig('main', HoloframeCodec)
+            StreamConfig('main', HoloframeCodec, readonly=True, coalesce=True,
+                         resolutions=(self.CONCAT_RESIZE_RATIO,))
         )
 
     async def on_image_input_stream(self, message):
@@ -47,22 +65,42 @@ class FramePipeline(BasePipeline):
         Called when a new image is received. Decides whether to buffer and concatenate.
         """
         if self.index % self.downsample_rate == 0:
-            image_rgb = cv2.cvtColor(message['image'], cv2.COLOR_BGR2RGB)
-            self.buffer.append(image_rgb)
+            self.frame_history.append(get_frame_image(message, rgb=True))
+            for ratio, builder in self.concat_builders.items():
+                builder.append_tile(get_frame_image(message, ratio, rgb=True))
             self.index = 0
+            self.concat_image_set = len(self.frame_history) >= self.buffer_limit
         self.index += 1
-        if len(self.buffer) >= self.buffer_limit:
-            long_picture = np.concatenate(self.buffer, axis=1)
-            self.concat_image = long_picture
-            self.concat_image_set = True
-            self.stored_frames.extend(self.buffer)
-            self.buffer = self.buffer[1:]  # drop oldest
+
+    def set_frame_history(self, capacity=None, max_bytes=None):
+        """
+        Replaces the frame history with an empty ring buffer.
+
+        Args:
+            capacity (int): Maximum number of frames kept, at least
+                ``buffer_limit``. Defaults to ``buffer_limit`` unless
+                ``max_bytes`` is given.
+            max_bytes (int): Optional cap on the history size in bytes.
+        """
+        if capacity is None and max_bytes is None:
+            # Full-resolution frames are only needed to seed new strips.
+            capacity = self.buffer_limit
+        if capacity is not None:
+            capacity = max(capacity, self.buffer_limit)
+        self.frame_history = FrameRingBuffer(capacity=capacity, max_bytes=max_bytes)
+
+    def is_accepting_input(self):
+        """
+        Whether input is processed. Input is ignored while busy, except in
+        latest-wins mode, where newer frames may supersede a running request.
+        """
+        return not self.busy or self.latest_wins
 
     async def check_and_process_image_stream(self, message, sid):
         """
         Validates if the input is from the designated image stream, and if so, processes it.
         """
-        if sid == self.image_stream_name and message is not None and not self.busy:
+        if sid == self.image_stream_name and message is not None and self.is_accepting_input():
             await self.on_image_input_stream(message)
             return True
         return False
@@ -74,25 +112,31 @@ class FramePipeline(BasePipeline):
         await self.check_and_process_image_stream(message, sid)
         return {}
 
-    async def get_frames(self, k=3):
+    async def get_frames(self, k=3, copy=False):
         """
-        Returns the last k frames including from the buffer and stored frames.
+        Returns the last k sampled frames, oldest first.
+
+        Frames are read-only views into the frame history unless ``copy`` is set.
         """
-        n_store_needed = k - len(self.buffer)
-        return self.stored_frames[-n_store_needed:] + self.buffer
+        return self.frame_history.get_frames(k, copy=copy)
 
-    async def get_concat_image(self, resize_ratio=0.3):
+    async def get_concat_image(self, resize_ratio=None):
         """
-        Returns the resized concatenated image if available.
+        Returns the concatenation of the last ``buffer_limit`` frames, resized
+        by ``resize_ratio``, if available.
+
+        The first request for a ratio registers a strip builder for it, seeded
+        from the frame history; later frames update it as they arrive. The
+        returned image is read-only. Defaults to ``CONCAT_RESIZE_RATIO``.
         """
-        if self.concat_image_set:
-            try:
-                resized = cv2.resize(self.concat_image, (0, 0), fx=resize_ratio, fy=resize_ratio)
-                return True, resized
-            except Exception as e:
-                print("Error during resizing:", e)
-                self.busy = False
-                return False, None
+        resize_ratio = resize_ratio or self.CONCAT_RESIZE_RATIO
+        builder = self.concat_builders.get(resize_ratio)
+        if builder is None:
+            builder = ConcatStripBuilder(self.buffer_limit, resize_ratio)
+            builder.extend(self.frame_history.get_frames(self.buffer_limit))
+            self.concat_builders[resize_ratio] = builder
+        if self.concat_image_set and builder.ready():
+            return True, builder.get_strip()
         return False, None
 
 
@@ -1,14 +1,20 @@
 import time
 import base64
+import hashlib
 import asyncio
 import requests
-import httpx
 import openai
 import cv2
 import numpy as np
 from pydantic import BaseModel
 
 from .frame_pipeline import FramePipeline
+from ...utils.image import ImageEncoder, compact_image_embedding
+from ...utils.single_flight import SingleFlight, SupersededError
+from ...llm import (
+    openai_headers, openai_chat_completion, openai_chat_completion_stream,
+    PromptPrefixCache, ResponseCache, hash_prompt,
+)
 
 import os
 
@@ -20,18 +26,17 @@ def configure_openai(api_key):
 
 
 def assemble_headers(api_key):
-    return {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {api_key}"
-    }
+    return openai_headers(api_key)
 
 
 def bytes_to_base64(image_bytes):
     return base64.b64encode(image_bytes).decode('utf-8')
 
 
-def assemble_gpt4v_request(image_bytes, system_prompt, prompt_text):
-    return {
+def assemble_gpt4v_request(image_bytes, system_prompt, prompt_text, mime_type="image/jpeg", cache_key=None):
+    # The system prompt is the static prefix; everything per-call follows it
+    # so that the provider's prompt cache can match the prefix.
+    payload = {
         "model": "gpt-4o-2024-08-06",
         "messages": [
             {"role": "system", "content": system_prompt},
@@ -39,27 +44,37 @@ def assemble_gpt4v_request(image_bytes, system_prompt, prompt_text):
                 "role": "user",
                 "content": [
                     {"type": "text", "text": prompt_text},
-                    {"type": "image_url", "image_url": {"url": f"data:image/jpeg;base64,{bytes_to_base64(image_bytes)}"}}
+                    {"type": "image_url", "image_url": {"url": f"data:{mime_type};base64,{bytes_to_base64(image_bytes)}"}}
                 ]
             }
         ]
     }
+    if cache_key:
+        payload["prompt_cache_key"] = cache_key
+    return payload
 
 
-def query_gpt4v(image_bytes, system_prompt, prompt_text, api_key):
-    payload = assemble_gpt4v_request(image_bytes, system_prompt, prompt_text)
+def query_gpt4v(image_bytes, system_prompt, prompt_text, api_key, mime_type="image/jpeg"):
+    payload = assemble_gpt4v_request(image_bytes, system_prompt, prompt_text, mime_type)
     headers = assemble_headers(api_key)
     response = requests.post("https://api.openai.com/v1/chat/completions", headers=headers, json=payload)
     return response.json()['choices'][0]['message']['content']
 
 
-async def query_gpt4v_async(image_bytes, system_prompt, prompt_text, api_key):
-    payload = assemble_gpt4v_request(image_bytes, system_prompt, prompt_text)
-    headers = assemble_headers(api_key)
-    timeout = httpx.Timeout(60.0, connect=30.0)
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        response = await client.post("https://api.openai.com/v1/chat/completions", headers=headers, json=payload)
-    return response.json()['choices'][0]['message']['content']
+async def query_gpt4v_async(image_bytes, system_prompt, prompt_text, api_key, mime_type="image/jpeg", cache_key=None):
+    payload = assemble_gpt4v_request(image_bytes, system_prompt, prompt_text, mime_type, cache_key)
+    response = await openai_chat_completion(payload, api_key)
+    return response['choices'][0]['message']['content']
+
+
+async def query_gpt4v_stream(image_bytes, system_prompt, prompt_text, api_key, mime_type="image/jpeg", cache_key=None):
+    payload = assemble_gpt4v_request(image_bytes, system_prompt, prompt_text, mime_type, cache_key)
+    async for delta in openai_chat_completion_stream(payload, api_key):
+        yield delta
+
+
+# Shared by all pipelines, so identical concurrent requests are sent once.
+shared_requests = SingleFlight()
 
 
 class Response(BaseModel):
@@ -86,6 +101,8 @@ class Response(BaseModel):
 
 
 class GPT4VPipeline(FramePipeline):
+    CONCAT_RESIZE_RATIO = 0.1
+
     def __init__(self,
                  system_prompt,
                  api_key = "",
@@ -103,31 +120,25 @@ class GPT4VPipeline(FramePipeline):
         self.system_prompt = system_prompt
         self.api_key = api_key or env_openai_key
         self.postprocess = postprocess
+        self.prompt_cache = PromptPrefixCache()
+        self.response_cache = None
+        self.set_image_encoder()
 
     async def on_input_stream(self, message, sid):
-        if self.busy:
+        if not self.is_accepting_input():
             return
         await self.check_and_process_image_stream(message, sid)
         return {}
 
-    async def on_image_input_stream(self, message):
-        if self.index % self.downsample_rate == 0:
-            image_rgb = cv2.cvtColor(message['image'], cv2.COLOR_BGR2RGB)
-            self.buffer.append(image_rgb)
-            self.index = 0
-        self.index += 1
-
-        if len(self.buffer) >= self.buffer_limit:
-            self.concat_image = np.concatenate(self.buffer, axis=1)
-            self.concat_image_set = True
-            self.buffer = []
-
     async def on_trigger_stream(self, message):
         self.busy = True
-        if self.concat_image_set:
+        flag, resized_image = await self.get_concat_image()
+        if flag:
+            response = await self.fetch_gpt_response_async(resized_image)
+            if response.get("superseded"):
+                # The newer request that replaced this one is still running.
+                return None
             try:
-                resized_image = cv2.resize(self.concat_image, (0, 0), fx=0.1, fy=0.1)
-                response = await self.fetch_gpt_response_async(resized_image)
                 if self.postprocess:
                     response = self.postprocess(response['result'])
                 return response
@@ -135,21 +146,154 @@ class GPT4VPipeline(FramePipeline):
                 self.busy = False
         self.busy = False
 
+    def set_image_encoder(self, format="jpeg", quality=85, max_bytes=None, max_tokens=None, min_quality=40):
+        """
+        Configures how images are encoded for upload.
+
+        Frames of a FramePipeline are RGB; see ``ImageEncoder`` for the arguments.
+        """
+        self.image_encoder = ImageEncoder(
+            format=format, quality=quality, max_bytes=max_bytes,
+            max_tokens=max_tokens, min_quality=min_quality, rgb=True,
+        )
+
+    def set_response_cache(self, ttl=60.0, maxsize=128, similarity_threshold=0.95, embedding_size=8):
+        """
+        Enables the semantic response cache; see ``ResponseCache``.
+
+        Args:
+            embedding_size (int): Edge of the thumbnail used as image embedding.
+        """
+        self.response_cache = ResponseCache(maxsize=maxsize, ttl=ttl, similarity_threshold=similarity_threshold)
+        self.response_cache_embedding_size = embedding_size
+
+    def set_request_coalescing(self, latest_wins=False):
+        """
+        Configures how concurrent model requests are coalesced.
+
+        Identical concurrent requests always share one in-flight call. With
+        ``latest_wins``, frames keep flowing while a request is in flight and
+        a newer request of this pipeline supersedes the stale one; the caller
+        of the superseded request gets a failed response flagged
+        ``superseded``, and the stale call is cancelled unless another
+        pipeline shares it. Needs a trigger queue with
+        ``max_in_flight`` of at least 2.
+        """
+        self.latest_wins = latest_wins
+
+    async def run_request(self, key, factory):
+        """Runs a model request through the shared single-flight layer."""
+        if self.latest_wins:
+            return await shared_requests.do_latest(id(self), key, factory)
+        return await shared_requests.do(key, factory)
+
+    @staticmethod
+    def get_request_key(image_bytes, system, prompt):
+        return hash_prompt(system, prompt, hashlib.blake2b(image_bytes, digest_size=16).hexdigest())
+
+    def get_metrics(self):
+        metrics = {"prompt_cache": self.prompt_cache.stats()}
+        if self.response_cache is not None:
+            metrics["response_cache"] = self.response_cache.stats()
+        return metrics
+
+    def get_response_cache_scope(self):
+        """Returns a hashable value, e.g. the current step, that cached responses must match."""
+        return None
+
+    def get_cached_response(self, image, system, prompt):
+        """
+        Looks up a cached response for the request.
+
+        Returns:
+            tuple: ``(response, cache_entry)``; ``response`` is None on a miss,
+            and ``cache_entry`` is passed to ``cache_response`` once the
+            response is known. Both are None when the cache is disabled.
+        """
+        if self.response_cache is None:
+            return None, None
+        key = (hash_prompt(system, prompt), self.get_response_cache_scope())
+        embedding = compact_image_embedding(image, self.response_cache_embedding_size)
+        return self.response_cache.get(key, embedding), (key, embedding)
+
+    def cache_response(self, cache_entry, response):
+        if cache_entry is not None and response.get("success"):
+            self.response_cache.put(*cache_entry, response)
+
+    def get_static_prompt(self):
+        """
+        Returns the static part of the prompt appended to the system prompt.
+
+        Content that only changes with the task (task description, output
+        schema) belongs here rather than in ``get_prompt_message``, so that
+        it is part of the cacheable prefix.
+        """
+        return ""
+
+    def get_prompt_prefix_key(self):
+        """Returns a hashable key that changes whenever ``get_static_prompt`` does."""
+        return None
+
+    def get_prompt_prefix(self):
+        """Returns the cached static prompt prefix."""
+        return self.prompt_cache.get(
+            (self.system_prompt, self.get_prompt_prefix_key()),
+            lambda: self.system_prompt + self.get_static_prompt(),
+        )
+
+    def resolve_system_prompt(self, system_prompt=None):
+        """Returns the system prompt and its prompt cache key."""
+        if system_prompt:
+            prefix = self.prompt_cache.get((system_prompt, None), lambda: system_prompt)
+        else:
+            prefix = self.get_prompt_prefix()
+        return prefix.text, prefix.cache_key
+
     async def fetch_gpt_response_async(self, image, prompt_message=None, system_prompt=None):
-        image_bytes = cv2.imencode('.png', image)[1].tobytes()
         prompt = prompt_message or self.get_prompt_message()
-        system = system_prompt or self.system_prompt
+        system, cache_key = self.resolve_system_prompt(system_prompt)
+        cached, cache_entry = self.get_cached_response(image, system, prompt)
+        if cached is not None:
+            return dict(cached, cached=True)
         try:
-            response = await query_gpt4v_async(image_bytes, system, prompt, self.api_key)
+            image_bytes = await self.image_encoder.encode_async(image)
+            response = await self.run_request(
+                self.get_request_key(image_bytes, system, prompt),
+                lambda: query_gpt4v_async(
+                    image_bytes, system, prompt, self.api_key, self.image_encoder.mime_type, cache_key
+                ),
+            )
             result, thoughts = self.parse_result(response)
-            return {"success": True, "response": response, "thoughts": thoughts, "result": result}
+            response = {"success": True, "response": response, "thoughts": thoughts, "result": result}
+        except SupersededError:
+            return {"success": False, "superseded": True, "response": "superseded by a newer request"}
         except Exception as e:
             return {"success": False, "response": str(e)}
+        self.cache_response(cache_entry, response)
+        return response
+
+    async def stream_gpt_response(self, image, prompt_message=None, system_prompt=None):
+        """
+        Streams the model response as it is generated.
+
+        Yields:
+            str: Text deltas, in order.
+        """
+        image_bytes = await self.image_encoder.encode_async(image)
+        prompt = prompt_message or self.get_prompt_message()
+        system, cache_key = self.resolve_system_prompt(system_prompt)
+        async for delta in query_gpt4v_stream(
+            image_bytes, system, prompt, self.api_key, self.image_encoder.mime_type, cache_key
+        ):
+            yield delta
 
     def fetch_gpt_response(self, image):
-        image_bytes = cv2.imencode('.png', image)[1].tobytes()
         try:
-            response = query_gpt4v(image_bytes, self.system_prompt, self.get_prompt_message(), self.api_key)
+            image_bytes = self.image_encoder.encode(image)
+            response = query_gpt4v(
+                image_bytes, self.get_prompt_prefix().text, self.get_prompt_message(), self.api_key,
+                self.image_encoder.mime_type
+            )
             result, thoughts = self.parse_result(response)
             return {"success": True, "response": response, "thoughts": thoughts, "result": result}
         except Exception as e:
@@ -1,6 +1,8 @@
+import os
 import asyncio
 import openai
 from ..base import BasePipeline
+from ...llm import openai_chat_completion
 
 
 def configure_openai(api_key: str):
@@ -18,14 +20,16 @@ class GPTPipeline(BasePipeline):
         output_stream_name (str): Stream to output the GPT response.
         sleep_time (int): Optional delay to simulate async waiting.
         preprocess (Callable): Optional preprocessing function on the message.
+        api_key (str): OpenAI API key; defaults to ``OPENAI_API_KEY``.
     """
 
     def __init__(self, prompt_message: str, input_stream_name: str, output_stream_name: str,
-                 sleep_time: int = 1, preprocess=None):
+                 sleep_time: int = 1, preprocess=None, api_key: str = ""):
         super().__init__([], [input_stream_name], [output_stream_name])
         self.prompt_message = prompt_message
         self.sleep_time = sleep_time
         self.preprocess = preprocess
+        self.api_key = api_key or openai.api_key or os.getenv("OPENAI_API_KEY")
 
     async def on_input_stream(self, buffer):
         """Handles incoming input messages (text)."""
@@ -43,17 +47,17 @@ class GPTPipeline(BasePipeline):
             {"role": "user", "content": message}
         ]
 
-        success, result = self.fetch_gpt_response(messages)
+        success, result = await self.fetch_gpt_response(messages)
         return result if success else "[Error] GPT request failed."
 
-    def fetch_gpt_response(self, messages, gpt_model="gpt-4"):
+    async def fetch_gpt_response(self, messages, gpt_model="gpt-4"):
         """Queries OpenAI GPT model with chat messages."""
         try:
-            completion = openai.ChatCompletion.create(
-                model=gpt_model,
-                messages=messages,
-                max_tokens=4096
-            )
+            completion = await openai_chat_completion({
+                "model": gpt_model,
+                "messages": messages,
+                "max_tokens": 4096
+            }, self.api_key)
             content = completion["choices"][0]["message"]["content"]
             return True, content
         except Exception as e:
@@ -5,15 +5,31 @@ class StreamConfig:
     Attributes:
         sid (str): The unique stream ID or name.
         codec (BaseCodec): The codec used to encode and decode data for this stream.
+        readonly (bool): Whether the pipeline only reads decoded messages of this
+            stream. Read-only subscribers of the same stream share one decoded
+            object per message instead of decoding it separately.
+        coalesce (bool): Whether only the latest pending message of this stream
+            matters (e.g. video frames). Pending messages are then replaced
+            instead of queued when the pipeline falls behind.
+        resolutions (tuple): Image resolutions the pipeline reads from frames of
+            this stream (scale factor, shortest edge or ``(width, height)``).
+            Frames shared between pipelines compute each declared resolution
+            once; see ``FramePyramid``.
     """
 
-    def __init__(self, sid: str, codec):
+    def __init__(self, sid: str, codec, readonly: bool = False, coalesce: bool = False, resolutions=()):
         """
         Initialize a StreamConfig instance.
 
         Args:
             sid (str): Stream identifier.
             codec (BaseCodec): Codec instance for encoding/decoding stream data.
+            readonly (bool): Declare that decoded messages are never modified.
+            coalesce (bool): Keep only the latest pending message of this stream.
+            resolutions (tuple): Image resolutions read from this stream's frames.
         """
         self.sid = sid
         self.codec = codec
+        self.readonly = readonly
+        self.coalesce = coalesce
+        self.resolutions = tuple(resolutions)
@@ -1,8 +1,32 @@
 from .time import parse_tms
 from .request import ProcessManager
+from .bounded_queue import BoundedQueue, OverflowPolicy
+from .readonly import make_readonly
+from .scheduler import TriggerScheduler, AdaptiveRatePolicy
+from .ring_buffer import FrameRingBuffer
+from .concat_strip import ConcatStripBuilder
+from .pyramid import FramePyramid, get_frame_image
+from .image import ImageEncoder, estimate_image_tokens, compact_image_embedding
+from .single_flight import SingleFlight, SupersededError
+from .micro_batcher import MicroBatcher
 
 
 __all__ = [
     "parse_tms",
     "ProcessManager",
+    "BoundedQueue",
+    "OverflowPolicy",
+    "make_readonly",
+    "TriggerScheduler",
+    "AdaptiveRatePolicy",
+    "FrameRingBuffer",
+    "ConcatStripBuilder",
+    "FramePyramid",
+    "get_frame_image",
+    "ImageEncoder",
+    "estimate_image_tokens",
+    "compact_image_embedding",
+    "SingleFlight",
+    "SupersededError",
+    "MicroBatcher",
 ]
\ No newline at end of file
@@ -0,0 +1,108 @@
+import asyncio
+from collections import deque
+from enum import Enum
+
+
+class OverflowPolicy(str, Enum):
+    """
+    Strategy applied when an item is put into a full BoundedQueue.
+
+    - ``DROP_OLDEST``: evict the oldest pending item to make room.
+    - ``DROP_NEWEST``: reject the incoming item.
+    - ``COALESCE_LATEST``: replace a pending item with the same key in place;
+      fall back to evicting the oldest item when no such item is pending.
+    """
+    DROP_OLDEST = "drop-oldest"
+    DROP_NEWEST = "drop-newest"
+    COALESCE_LATEST = "coalesce-latest"
+
+
+class BoundedQueue:
+    """
+    Fixed-capacity asyncio queue with a configurable overflow policy.
+
+    Unlike ``asyncio.Queue``, ``put_nowait`` never raises on a full queue;
+    the overflow policy decides which item is discarded instead. Counters for
+    dropped and coalesced items are kept for monitoring.
+
+    Attributes:
+        maxsize (int): Maximum number of pending items.
+        overflow (OverflowPolicy): Policy applied when the queue is full.
+        dropped (int): Number of items discarded due to overflow.
+        coalesced (int): Number of items that replaced a pending item.
+        high_water (int): Largest depth observed since creation.
+    """
+
+    def __init__(self, maxsize: int = 8, overflow="drop-oldest"):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.overflow = OverflowPolicy(overflow)
+        self.dropped = 0
+        self.coalesced = 0
+        self.high_water = 0
+        self._items = deque()  # (key, item) pairs
+        self._not_empty = asyncio.Event()
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+    def empty(self) -> bool:
+        return not self._items
+
+    def full(self) -> bool:
+        return len(self._items) >= self.maxsize
+
+    def put_nowait(self, item, key=None, coalesce=None) -> bool:
+        """
+        Enqueue an item, applying the overflow policy if needed.
+
+        Args:
+            item (Any): The item to enqueue.
+            key (Hashable): Optional key used for coalescing.
+            coalesce (bool): Force coalescing on or off for this item. Defaults
+                to the queue's overflow policy.
+
+        Returns:
+            bool: False if the incoming item was rejected, True otherwise.
+        """
+        if coalesce is None:
+            coalesce = self.overflow is OverflowPolicy.COALESCE_LATEST
+        if coalesce and key is not None:
+            for i, (pending_key, _) in enumerate(self._items):
+                if pending_key == key:
+                    self._items[i] = (key, item)
+                    self.coalesced += 1
+                    return True
+
+        if self.full():
+            if self.overflow is OverflowPolicy.DROP_NEWEST:
+                self.dropped += 1
+                return False
+            self._items.popleft()
+            self.dropped += 1
+
+        self._items.append((key, item))
+        self.high_water = max(self.high_water, len(self._items))
+        self._not_empty.set()
+        return True
+
+    async def get(self):
+        """Wait for and remove the oldest pending item."""
+        while not self._items:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        _, item = self._items.popleft()
+        if not self._items:
+            self._not_empty.clear()
+        return item
+
+    def stats(self) -> dict:
+        """Return a snapshot of the queue counters."""
+        return {
+            "depth": self.qsize(),
+            "maxsize": self.maxsize,
+            "high_water": self.high_water,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+        }
@@ -0,0 +1,85 @@
+import cv2
+import numpy as np
+
+from .pyramid import resolve_size
+
+
+class ConcatStripBuilder:
+    """
+    Incrementally maintained horizontal strip of the latest downscaled frames.
+
+    Each frame is downscaled once on arrival, directly into a preallocated
+    tile slot. Tiles are stored circularly, so sliding the window by one frame
+    rewrites a single tile. The strip is assembled in chronological order only
+    when it is requested, and cached until the next frame arrives.
+
+    Args:
+        n_tiles (int): Number of frames in the strip.
+        scale (float): Resize factor applied to each frame.
+    """
+
+    def __init__(self, n_tiles: int, scale: float):
+        if n_tiles < 1:
+            raise ValueError("n_tiles must be at least 1")
+        self.n_tiles = n_tiles
+        self.scale = scale
+        self.tiles = None
+        self.next = 0
+        self.count = 0
+        self.strip = None
+
+    def ready(self) -> bool:
+        return self.count >= self.n_tiles
+
+    def append(self, frame):
+        """
+        Downscale a frame into the tile slot of the oldest frame.
+
+        Args:
+            frame (np.ndarray): Full-resolution frame.
+        """
+        size = resolve_size(frame.shape, self.scale)
+        slot = self.next_slot((size[1], size[0], *frame.shape[2:]), frame.dtype)
+        cv2.resize(frame, size, dst=slot, interpolation=cv2.INTER_AREA)
+        self.advance()
+
+    def append_tile(self, tile):
+        """
+        Copy an already downscaled frame into the tile slot of the oldest frame.
+
+        Args:
+            tile (np.ndarray): Frame resized by ``scale``, e.g. a ``FramePyramid`` level.
+        """
+        np.copyto(self.next_slot(tile.shape, tile.dtype), tile)
+        self.advance()
+
+    def next_slot(self, tile_shape, dtype):
+        if self.tiles is None or self.tiles.shape[1:] != tuple(tile_shape) or self.tiles.dtype != dtype:
+            self.tiles = np.empty((self.n_tiles, *tile_shape), dtype=dtype)
+            self.next = 0
+            self.count = 0
+        return self.tiles[self.next]
+
+    def advance(self):
+        self.next = (self.next + 1) % self.n_tiles
+        self.count = min(self.count + 1, self.n_tiles)
+        self.strip = None
+
+    def extend(self, frames):
+        for frame in frames:
+            self.append(frame)
+
+    def get_strip(self):
+        """
+        Return the strip of the latest ``n_tiles`` frames, oldest first.
+
+        Returns:
+            np.ndarray: The strip, or None until ``n_tiles`` frames were appended.
+        """
+        if not self.ready():
+            return None
+        if self.strip is None:
+            order = [(self.next + i) % self.n_tiles for i in range(self.n_tiles)]
+            self.strip = np.concatenate([self.tiles[i] for i in order], axis=1)
+            self.strip.flags.writeable = False
+        return self.strip
@@ -0,0 +1,158 @@
+import math
+import asyncio
+
+import cv2
+import numpy as np
+
+
+IMAGE_FORMATS = {
+    # name: (extension, quality flag, MIME type)
+    "jpeg": (".jpg", cv2.IMWRITE_JPEG_QUALITY, "image/jpeg"),
+    "webp": (".webp", cv2.IMWRITE_WEBP_QUALITY, "image/webp"),
+    "png": (".png", None, "image/png"),
+}
+
+
+def estimate_image_tokens(width: int, height: int) -> int:
+    """
+    Estimate the prompt tokens billed for an image in high-detail mode.
+
+    The image is fit within 2048x2048, its shortest side is scaled down to
+    768 pixels, and each 512x512 tile costs 170 tokens on top of a base of 85.
+
+    Args:
+        width (int): Image width in pixels.
+        height (int): Image height in pixels.
+
+    Returns:
+        int: Estimated number of tokens.
+    """
+    scale = min(1.0, 2048 / max(width, height))
+    width, height = width * scale, height * scale
+    scale = min(1.0, 768 / min(width, height))
+    width, height = width * scale, height * scale
+    return 85 + 170 * math.ceil(width / 512) * math.ceil(height / 512)
+
+
+def compact_image_embedding(image, size: int = 8):
+    """
+    Compute a tiny, unit-norm embedding of an image's coarse layout.
+
+    The image is reduced to a ``size`` x ``size`` grayscale thumbnail and
+    centred, so that the cosine similarity of two embeddings is high for
+    frames showing the same scene and robust to small shifts in exposure.
+
+    Args:
+        image (np.ndarray): Image, grayscale or three-channel.
+        size (int): Thumbnail edge in pixels.
+
+    Returns:
+        np.ndarray: float32 vector of length ``size * size``.
+    """
+    if image.ndim == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    thumbnail = cv2.resize(image, (size, size), interpolation=cv2.INTER_AREA)
+    embedding = thumbnail.astype(np.float32).ravel()
+    embedding -= embedding.mean()
+    norm = np.linalg.norm(embedding)
+    return embedding / norm if norm > 0 else embedding
+
+
+class ImageEncoder:
+    """
+    Encodes images for upload to vision models under a size budget.
+
+    Images are encoded as JPEG, WebP or PNG. With ``max_tokens``, the image
+    is first downscaled until its estimated token cost fits the budget. With
+    ``max_bytes``, the quality is lowered (by bisection, down to
+    ``min_quality``) and, if that is not enough, the image is downscaled
+    until the payload fits.
+
+    Encoding is CPU-bound; use ``encode_async`` from the event loop to run
+    it in a worker thread.
+
+    Args:
+        format (str): ``jpeg``, ``webp`` or ``png``.
+        quality (int): Encoding quality (1-100); ignored for PNG.
+        max_bytes (int): Optional payload budget in bytes.
+        max_tokens (int): Optional image token budget.
+        min_quality (int): Lowest quality tried to meet ``max_bytes``.
+        rgb (bool): Whether input images are RGB rather than OpenCV's BGR.
+    """
+
+    def __init__(self, format: str = "jpeg", quality: int = 85, max_bytes: int = None,
+                 max_tokens: int = None, min_quality: int = 40, rgb: bool = False):
+        if format not in IMAGE_FORMATS:
+            raise ValueError(f"Unsupported image format {format!r}, expected one of {list(IMAGE_FORMATS)}")
+        self.format = format
+        self.quality = quality
+        self.max_bytes = max_bytes
+        self.max_tokens = max_tokens
+        self.min_quality = min(min_quality, quality)
+        self.rgb = rgb
+
+    @property
+    def mime_type(self) -> str:
+        return IMAGE_FORMATS[self.format][2]
+
+    def _encode(self, image, quality):
+        extension, quality_flag, _ = IMAGE_FORMATS[self.format]
+        params = [quality_flag, int(quality)] if quality_flag is not None else []
+        ok, encoded = cv2.imencode(extension, image, params)
+        if not ok:
+            raise ValueError(f"Failed to encode image as {self.format}")
+        return encoded.tobytes()
+
+    def fit_tokens(self, image):
+        """Downscale ``image`` until its estimated token cost fits ``max_tokens``."""
+        height, width = image.shape[:2]
+        scale = 1.0
+        while estimate_image_tokens(width * scale, height * scale) > self.max_tokens and min(width, height) * scale > 64:
+            scale *= 0.9
+        if scale < 1.0:
+            image = cv2.resize(image, (0, 0), fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        return image
+
+    def encode(self, image) -> bytes:
+        """
+        Encode an image within the configured budgets.
+
+        Args:
+            image (np.ndarray): Image to encode.
+
+        Returns:
+            bytes: Encoded image.
+        """
+        if self.rgb and image.ndim == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+        if self.max_tokens:
+            image = self.fit_tokens(image)
+        encoded = self._encode(image, self.quality)
+        if not self.max_bytes or len(encoded) <= self.max_bytes:
+            return encoded
+
+        if IMAGE_FORMATS[self.format][1] is not None:
+            low, high = self.min_quality, self.quality - 1
+            best = None
+            while low <= high:
+                quality = (low + high) // 2
+                candidate = self._encode(image, quality)
+                if len(candidate) <= self.max_bytes:
+                    best, low = candidate, quality + 1
+                else:
+                    high = quality - 1
+            if best is not None:
+                return best
+            quality = self.min_quality
+        else:
+            quality = self.quality
+
+        while len(encoded) > self.max_bytes and min(image.shape[:2]) > 16:
+            scale = max(0.5, min(0.9, math.sqrt(self.max_bytes / len(encoded))))
+            image = cv2.resize(image, (0, 0), fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+            encoded = self._encode(image, quality)
+        return encoded
+
+    async def encode_async(self, image) -> bytes:
+        """Encode an image in a worker thread."""
+        return await asyncio.to_thread(self.encode, image)
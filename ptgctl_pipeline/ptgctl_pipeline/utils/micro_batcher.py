@@ -0,0 +1,96 @@
+import asyncio
+
+from .single_flight import SupersededError
+
+
+class MicroBatcher:
+    """
+    Groups items submitted while the model is busy into one batch call.
+
+    ``process_batch`` is synchronous (e.g. a model forward pass) and runs in
+    a worker thread, one batch at a time. Items submitted while a batch runs
+    are collected and processed together as soon as the model is free, so
+    the batch size adapts to the arrival rate and the inference time. An
+    item arriving while the model is idle waits at most ``max_wait`` seconds
+    for others; 0 processes it right away.
+
+    At most ``max_pending`` items wait for the model; when more arrive, the
+    oldest are dropped and their callers get ``SupersededError``, so stale
+    items never pile up.
+
+    Args:
+        process_batch (Callable[[list], list]): Maps a list of items to a
+            list of results, in the same order.
+        max_batch (int): Maximum number of items per batch.
+        max_wait (float): Maximum time in seconds an item arriving at an idle
+            model waits for others.
+        max_pending (int): Maximum number of items waiting for the model;
+            defaults to ``max_batch``.
+    """
+
+    def __init__(self, process_batch, max_batch: int = 8, max_wait: float = 0.0, max_pending: int = None):
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+        self.process_batch = process_batch
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.max_pending = max_pending or max_batch
+        self.pending = []
+        self.full = None
+        self.worker = None
+        self.dropped = 0
+
+    async def submit(self, item):
+        """
+        Adds an item to the next batch and waits for its result.
+
+        Args:
+            item: Input of ``process_batch``.
+
+        Returns:
+            The result of ``process_batch`` for this item.
+
+        Raises:
+            SupersededError: When the item was dropped for newer ones.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append((item, future))
+        while len(self.pending) > self.max_pending:
+            _, stale = self.pending.pop(0)
+            self.dropped += 1
+            if not stale.done():
+                stale.set_exception(SupersededError())
+        if self.worker is None:
+            self.full = asyncio.Event()
+            self.worker = asyncio.ensure_future(self.process_pending())
+        if len(self.pending) >= self.max_batch:
+            self.full.set()
+        return await future
+
+    async def process_pending(self):
+        try:
+            if self.max_wait > 0 and len(self.pending) < self.max_batch:
+                try:
+                    await asyncio.wait_for(self.full.wait(), self.max_wait)
+                except asyncio.TimeoutError:
+                    pass
+            while self.pending:
+                batch, self.pending = self.pending[:self.max_batch], self.pending[self.max_batch:]
+                await self.run([(item, future) for item, future in batch if not future.done()])
+        finally:
+            self.worker = None
+
+    async def run(self, batch):
+        if not batch:
+            return
+        items = [item for item, _ in batch]
+        try:
+            results = await asyncio.to_thread(self.process_batch, items)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
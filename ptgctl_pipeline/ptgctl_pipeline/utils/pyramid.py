@@ -0,0 +1,112 @@
+import cv2
+
+
+def resolve_size(shape, resolution):
+    """
+    Convert a resolution spec into an output ``(width, height)``.
+
+    A resolution is one of:
+
+    - a float: scale factor applied to both dimensions (``0.3``);
+    - an int: target length of the shortest edge, keeping the aspect ratio
+      (``224``, as expected by CLIP-style processors);
+    - a ``(width, height)`` pair: exact output size.
+
+    Args:
+        shape (tuple): Shape of the full-resolution image.
+        resolution (float | int | tuple): Resolution spec.
+
+    Returns:
+        tuple[int, int]: Output width and height.
+    """
+    height, width = shape[:2]
+    if isinstance(resolution, (tuple, list)):
+        return int(resolution[0]), int(resolution[1])
+    if isinstance(resolution, int):
+        scale = resolution / min(height, width)
+    else:
+        scale = float(resolution)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+class FramePyramid:
+    """
+    Cache of downscaled (and color-converted) versions of one frame.
+
+    Each level is computed at most once. A new level is area-resized from the
+    smallest cached level that is still at least as large, so a chain of
+    resolutions reads the full-resolution image only once. Resolutions
+    declared up front (see ``StreamConfig.resolutions``) are built
+    coarse-to-fine when a smaller one is first requested, so every declared
+    level derives from its nearest larger neighbour.
+
+    Args:
+        image (np.ndarray): Full-resolution BGR image.
+        readonly (bool): Mark every cached level read-only.
+    """
+
+    def __init__(self, image, readonly: bool = False):
+        self.image = image
+        self.readonly = readonly
+        self.declared = set()
+        self.levels = {(self.full_size, False): image}
+
+    @property
+    def full_size(self):
+        return self.image.shape[1], self.image.shape[0]
+
+    def declare(self, resolutions):
+        """Register resolutions that subscribers of this frame will request."""
+        self.declared.update(resolve_size(self.image.shape, r) for r in resolutions)
+
+    def get(self, resolution=1.0, rgb: bool = False):
+        """
+        Return the frame at ``resolution``, converted to RGB if ``rgb`` is set.
+
+        Args:
+            resolution (float | int | tuple): Resolution spec, see ``resolve_size``.
+            rgb (bool): Convert from BGR to RGB.
+
+        Returns:
+            np.ndarray: The cached level.
+        """
+        size = resolve_size(self.image.shape, resolution)
+        key = (size, rgb)
+        if key in self.levels:
+            return self.levels[key]
+        if rgb:
+            level = cv2.cvtColor(self.get(size), cv2.COLOR_BGR2RGB)
+        else:
+            for declared in sorted(self.declared, reverse=True):
+                if declared[0] > size[0] and declared[1] > size[1]:
+                    self.get(declared)
+            source = min(
+                (image for (s, c), image in self.levels.items()
+                 if not c and s[0] >= size[0] and s[1] >= size[1]),
+                key=lambda image: image.shape[0] * image.shape[1],
+            )
+            level = cv2.resize(source, size, interpolation=cv2.INTER_AREA)
+        if self.readonly:
+            level.flags.writeable = False
+        self.levels[key] = level
+        return level
+
+
+def get_frame_image(message, resolution=1.0, rgb: bool = False):
+    """
+    Return the image of a frame message at ``resolution``.
+
+    Lazily decoded frames share their pyramid across pipelines; plain dict
+    messages are resized directly.
+
+    Args:
+        message (LazyHoloframe | dict): Frame message exposing an ``image``.
+        resolution (float | int | tuple): Resolution spec, see ``resolve_size``.
+        rgb (bool): Convert from BGR to RGB.
+
+    Returns:
+        np.ndarray: The image.
+    """
+    if hasattr(message, "get_image"):
+        return message.get_image(resolution, rgb=rgb)
+    return FramePyramid(message["image"]).get(resolution, rgb=rgb)
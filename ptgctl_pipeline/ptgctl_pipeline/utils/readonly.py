@@ -0,0 +1,28 @@
+def make_readonly(data):
+    """
+    Mark the array payloads of a decoded message as read-only.
+
+    Decoded messages may be shared between several pipelines, so any NumPy
+    array found in the message (directly, or inside dicts, lists and tuples)
+    is flagged non-writeable. Containers themselves are left untouched and
+    are read-only by contract only. Objects that decode lazily expose a
+    ``freeze`` method instead, which applies the same rule once decoded.
+
+    Args:
+        data (Any): Decoded stream message.
+
+    Returns:
+        Any: The same object, with its arrays marked read-only.
+    """
+    flags = getattr(data, "flags", None)
+    if callable(getattr(data, "freeze", None)):
+        data.freeze()
+    elif flags is not None and hasattr(flags, "writeable"):
+        flags.writeable = False
+    elif isinstance(data, dict):
+        for value in data.values():
+            make_readonly(value)
+    elif isinstance(data, (list, tuple)):
+        for value in data:
+            make_readonly(value)
+    return data
@@ -0,0 +1,105 @@
+import numpy as np
+
+
+class FrameRingBuffer:
+    """
+    Fixed-capacity ring buffer of equally shaped frames.
+
+    Storage is a single preallocated array allocated on the first append,
+    once the frame shape and dtype are known. Appending copies the frame into
+    the next slot in O(1), overwriting the oldest frame when the buffer is
+    full. A frame with a different shape or dtype resets the buffer.
+
+    The capacity is given in frames, in bytes, or both (the smaller wins).
+    A byte capacity is converted to frames from the size of the first frame,
+    keeping at least one frame.
+
+    Args:
+        capacity (int): Maximum number of frames.
+        max_bytes (int): Maximum size of the storage in bytes.
+    """
+
+    def __init__(self, capacity: int = None, max_bytes: int = None):
+        if capacity is None and max_bytes is None:
+            raise ValueError("FrameRingBuffer needs a capacity in frames or bytes")
+        if capacity is not None and capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.max_bytes = max_bytes
+        self.storage = None
+        self.start = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def maxlen(self):
+        """Capacity in frames, or None until the first frame is appended."""
+        return None if self.storage is None else len(self.storage)
+
+    @property
+    def nbytes(self):
+        """Size of the preallocated storage in bytes."""
+        return 0 if self.storage is None else self.storage.nbytes
+
+    def allocate(self, shape, dtype):
+        frame_bytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        capacity = self.capacity
+        if self.max_bytes is not None:
+            by_bytes = max(1, self.max_bytes // max(frame_bytes, 1))
+            capacity = by_bytes if capacity is None else min(capacity, by_bytes)
+        self.storage = np.empty((capacity, *shape), dtype=dtype)
+        self.start = 0
+        self.size = 0
+
+    def append(self, frame):
+        """
+        Copy a frame into the buffer, evicting the oldest one when full.
+
+        Args:
+            frame (np.ndarray): Frame to store.
+        """
+        frame = np.asarray(frame)
+        if self.storage is None or self.storage.shape[1:] != frame.shape or self.storage.dtype != frame.dtype:
+            self.allocate(frame.shape, frame.dtype)
+        maxlen = len(self.storage)
+        index = (self.start + self.size) % maxlen
+        np.copyto(self.storage[index], frame)
+        if self.size < maxlen:
+            self.size += 1
+        else:
+            self.start = (self.start + 1) % maxlen
+
+    def get_frames(self, k: int = None, copy: bool = False):
+        """
+        Return the last ``k`` frames, oldest first.
+
+        Frames are read-only views into the storage unless ``copy`` is set.
+        A view is overwritten once ``maxlen`` newer frames have been appended,
+        so callers that hold frames across many appends should copy them.
+
+        Args:
+            k (int): Number of frames; all stored frames if None.
+            copy (bool): Return copies instead of views.
+
+        Returns:
+            list[np.ndarray]: Up to ``k`` frames.
+        """
+        k = self.size if k is None else max(0, min(k, self.size))
+        maxlen = self.maxlen
+        frames = []
+        for i in range(self.size - k, self.size):
+            frame = self.storage[(self.start + i) % maxlen]
+            if copy:
+                frame = frame.copy()
+            else:
+                frame = frame.view()
+                frame.flags.writeable = False
+            frames.append(frame)
+        return frames
+
+    def clear(self):
+        """Drop all frames, keeping the storage."""
+        self.start = 0
+        self.size = 0
@@ -0,0 +1,148 @@
+import random
+import asyncio
+
+
+TRIGGER_PAYLOAD = b"Trigger"
+
+
+class AdaptiveRatePolicy:
+    """
+    AIMD policy adapting a trigger interval to the load of its pipelines.
+
+    The trigger rate (1 / interval) grows additively by ``increase`` while the
+    triggered pipelines keep up, and is multiplied by ``decrease`` when they
+    fall behind, i.e. when triggers are waiting in their queues or the
+    observed service time exceeds the current interval. The interval is kept
+    within ``[min_interval, max_interval]``.
+
+    Args:
+        min_interval (float): Shortest allowed interval in seconds.
+        max_interval (float): Longest allowed interval in seconds.
+        increase (float): Additive rate increase per tick, in triggers per second.
+        decrease (float): Multiplicative rate factor on congestion, in (0, 1).
+    """
+
+    def __init__(self, min_interval: float, max_interval: float, increase: float = 0.05, decrease: float = 0.5):
+        if not 0 < min_interval <= max_interval:
+            raise ValueError("Adaptive trigger bounds must satisfy 0 < min_interval <= max_interval")
+        if not 0 < decrease < 1:
+            raise ValueError("Adaptive trigger decrease must be in (0, 1)")
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.increase = increase
+        self.decrease = decrease
+
+    def update(self, interval: float, service_time: float, backlog: int) -> float:
+        """
+        Computes the next interval.
+
+        Args:
+            interval (float): Current interval in seconds.
+            service_time (float): Observed per-trigger service time in seconds.
+            backlog (int): Number of triggers waiting in the pipelines' queues.
+
+        Returns:
+            float: The next interval in seconds.
+        """
+        rate = 1.0 / interval
+        if backlog > 0 or service_time > interval:
+            rate *= self.decrease
+        else:
+            rate += self.increase
+        return min(max(1.0 / rate, self.min_interval), self.max_interval)
+
+
+class ScheduledTrigger:
+    """
+    State of one periodic trigger stream.
+
+    Attributes:
+        stream_name (str): Server-side trigger stream ID.
+        interval (float): Period between ticks in seconds.
+        jitter (float): Maximum random offset of a tick, as a fraction of the interval.
+        mirror (bool): Whether ticks are also posted to the remote stream.
+        policy (AdaptiveRatePolicy): Optional policy adapting the interval to load.
+        ticks (int): Number of ticks fired so far.
+        skipped (int): Number of ticks skipped because the loop fell behind.
+    """
+
+    def __init__(self, stream_name: str, interval: float, jitter: float = 0.0, mirror: bool = False,
+                 policy: AdaptiveRatePolicy = None):
+        if interval <= 0:
+            raise ValueError("Trigger interval must be positive")
+        if not 0 <= jitter < 1:
+            raise ValueError("Trigger jitter must be in [0, 1)")
+        self.stream_name = stream_name
+        self.interval = interval
+        self.jitter = jitter
+        self.mirror = mirror
+        self.policy = policy
+        self.ticks = 0
+        self.skipped = 0
+
+
+class TriggerScheduler:
+    """
+    In-process asyncio scheduler that fires periodic trigger events.
+
+    Ticks are scheduled against absolute deadlines (each deadline is the
+    previous one plus the interval), so processing time and sleep overshoot
+    do not accumulate into drift. Jitter offsets individual ticks around their
+    deadline without moving the deadline grid. When the event loop falls more
+    than one interval behind, the missed ticks are skipped instead of fired in
+    a burst.
+
+    Triggers with an ``AdaptiveRatePolicy`` re-evaluate their interval before
+    every tick from the load reported by ``load``.
+
+    Args:
+        dispatch (Callable[[str, bytes], None]): Delivers a tick locally.
+        mirror (Callable[[str, bytes], None]): Optional; posts a tick to the
+            remote stream for triggers registered with ``mirror=True``.
+        load (Callable[[str], tuple[float, int]]): Optional; returns the
+            observed service time and backlog of the pipelines triggered by a
+            stream.
+    """
+
+    def __init__(self, dispatch, mirror=None, load=None):
+        self.dispatch = dispatch
+        self.mirror = mirror
+        self.load = load
+        self.triggers = {}
+
+    def add_trigger(self, stream_name: str, interval: float, jitter: float = 0.0, mirror: bool = False,
+                    policy: AdaptiveRatePolicy = None):
+        """Registers (or replaces) a periodic trigger stream."""
+        self.triggers[stream_name] = ScheduledTrigger(
+            stream_name, interval, jitter=jitter, mirror=mirror, policy=policy
+        )
+        return self.triggers[stream_name]
+
+    def get_stream_names(self):
+        return list(self.triggers.keys())
+
+    async def run(self):
+        """Runs all registered triggers until cancelled."""
+        await asyncio.gather(*(self.run_trigger(trigger) for trigger in self.triggers.values()))
+
+    async def run_trigger(self, trigger: ScheduledTrigger):
+        """Fires a single trigger on its deadline grid."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+        while True:
+            if trigger.policy is not None and self.load is not None and trigger.ticks:
+                trigger.interval = trigger.policy.update(trigger.interval, *self.load(trigger.stream_name))
+            deadline += trigger.interval
+            now = loop.time()
+            if now - deadline > trigger.interval:
+                missed = int((now - deadline) // trigger.interval)
+                trigger.skipped += missed
+                deadline += missed * trigger.interval
+            offset = random.uniform(-trigger.jitter, trigger.jitter) * trigger.interval
+            delay = deadline + offset - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            trigger.ticks += 1
+            self.dispatch(trigger.stream_name, TRIGGER_PAYLOAD)
+            if trigger.mirror and self.mirror is not None:
+                self.mirror(trigger.stream_name, TRIGGER_PAYLOAD)
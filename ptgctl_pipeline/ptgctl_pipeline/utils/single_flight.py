@@ -0,0 +1,126 @@
+import asyncio
+
+
+class SupersededError(Exception):
+    """Raised to callers whose request was replaced by a newer one."""
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical async calls into one in-flight call.
+
+    ``do`` runs ``factory()`` once per key at a time: callers arriving while
+    a call with the same key is in flight await its result instead of
+    starting their own. ``do_latest`` additionally keeps at most one call
+    per group: a call with a new key detaches the group's callers from the
+    stale call, and they get ``SupersededError``.
+
+    Cancelling one caller never cancels a call other callers still wait on,
+    so a stale call is only cancelled when nobody else joined it.
+    """
+
+    def __init__(self):
+        self.calls = {}
+        self.latest = {}
+
+    async def do(self, key, factory):
+        """
+        Runs ``factory()`` unless a call with ``key`` is already in flight.
+
+        Args:
+            key (Hashable): Request identity.
+            factory (Callable[[], Awaitable]): Starts the call.
+
+        Returns:
+            The result of the shared call.
+        """
+        call = self.calls.get(key)
+        if call is None:
+            call = self.calls[key] = Call(asyncio.ensure_future(factory()))
+            call.on_abandon = lambda: self.forget(key, call)
+            call.task.add_done_callback(lambda _: self.forget(key, call))
+        return await call.wait()
+
+    async def do_latest(self, group, key, factory):
+        """
+        Like ``do``, but supersedes the group's in-flight call if its key differs.
+
+        Args:
+            group (Hashable): Calls of a group supersede each other, e.g. one
+                group per pipeline.
+            key (Hashable): Request identity.
+            factory (Callable[[], Awaitable]): Starts the call.
+
+        Returns:
+            The result of the shared call.
+
+        Raises:
+            SupersededError: When a newer call of the group replaced this one.
+        """
+        latest = self.latest.get(group)
+        if latest is None or latest.key != key:
+            if latest is not None:
+                latest.supersede()
+            latest = self.latest[group] = Group(key)
+        waiter = asyncio.ensure_future(self.do(key, factory))
+        latest.waiters.add(waiter)
+        try:
+            return await waiter
+        except asyncio.CancelledError:
+            if latest.superseded and waiter.cancelled():
+                raise SupersededError() from None
+            raise
+        finally:
+            latest.waiters.discard(waiter)
+            if self.latest.get(group) is latest and not latest.waiters:
+                del self.latest[group]
+
+    def forget(self, key, call):
+        if self.calls.get(key) is call:
+            del self.calls[key]
+
+    def in_flight(self):
+        """Number of calls currently in flight."""
+        return len(self.calls)
+
+
+class Call:
+    """One in-flight call shared by its waiters."""
+
+    def __init__(self, task):
+        self.task = task
+        self.waiters = 0
+        self.on_abandon = None
+
+    async def wait(self):
+        self.waiters += 1
+        try:
+            return await asyncio.shield(self.task)
+        except asyncio.CancelledError:
+            if self.task.cancelled():
+                # This waiter joined a call that its other waiters abandoned.
+                raise SupersededError() from None
+            raise
+        finally:
+            self.waiters -= 1
+            if self.waiters == 0 and not self.task.done():
+                # The last waiter gave up on the call; forget it right away,
+                # so that a new caller with the same key starts a fresh one.
+                if self.on_abandon is not None:
+                    self.on_abandon()
+                self.task.cancel()
+
+
+class Group:
+    """The callers of a ``do_latest`` group waiting on its latest key."""
+
+    def __init__(self, key):
+        self.key = key
+        self.waiters = set()
+        self.superseded = False
+
+    def supersede(self):
+        # Detach the callers; the call itself is cancelled by its last waiter.
+        self.superseded = True
+        for waiter in self.waiters:
+            waiter.cancel()
@@ -1,13 +1,28 @@
+from ptgctl_pipeline.ptgctl_pipeline.llm import configure_llm_client
+
+
 class Agent:
     def __init__(self, server, pipelines, config):
         self.server = server
         self.pipelines = pipelines
+        self.server.set_trigger_queue_defaults(config.get('trigger_queue', {}))
+        self.server.set_input_mailbox_defaults(config.get('input_mailbox', {}))
+        if 'metrics_interval' in config:
+            self.server.metrics_interval = config['metrics_interval']
+        if 'llm' in config:
+            configure_llm_client(config['llm'])
         for pipeline in self.pipelines:
             self.server.register_pipeline(pipeline)
         
         if 'triggers' in config:
             for trigger in config['triggers']:
-                server.register_trigger(trigger['stream'], interval=trigger['interval'])
+                server.register_trigger(
+                    trigger['stream'],
+                    interval=trigger['interval'],
+                    jitter=trigger.get('jitter', 0.0),
+                    mirror=trigger.get('mirror', False),
+                    adaptive=trigger.get('adaptive'),
+                )
 
     async def start(self):
         await self.server.start()
\ No newline at end of file
@@ -75,5 +75,15 @@ class PipelineFactory:
                 stream_map=entry.get("stream_map", {}),
                 **filtered_config,
             )
+            pipeline.trigger_queue_config = entry.get("trigger_queue", {})
+            pipeline.input_mailbox_config = entry.get("input_mailbox", {})
+            if "frame_history" in entry and hasattr(pipeline, "set_frame_history"):
+                pipeline.set_frame_history(**entry["frame_history"])
+            if "image_encoder" in entry and hasattr(pipeline, "set_image_encoder"):
+                pipeline.set_image_encoder(**entry["image_encoder"])
+            if "response_cache" in entry and hasattr(pipeline, "set_response_cache"):
+                pipeline.set_response_cache(**entry["response_cache"])
+            if "request_coalescing" in entry and hasattr(pipeline, "set_request_coalescing"):
+                pipeline.set_request_coalescing(**entry["request_coalescing"])
             pipelines.append(pipeline)
         return pipelines
@@ -0,0 +1,41 @@
+import json
+import math
+
+import pytest
+
+from ptgctl_pipeline.ptgctl_pipeline.codec.json_backend import JSON_BACKENDS, get_json_backend
+
+
+INSTALLED_BACKENDS = [name for name, (_, module) in JSON_BACKENDS.items() if module is not None]
+
+
+@pytest.fixture(params=INSTALLED_BACKENDS)
+def backend(request):
+    return get_json_backend(request.param)
+
+
+@pytest.mark.parametrize("value", [
+    {"step": "Pour water", "index": 3, "scores": [0.5, 1.0], "done": False, "next": None},
+    {"text": "café"},
+    {"wide": 2 ** 70, "negative": -(2 ** 70), "unsigned": 2 ** 63},
+])
+def test_round_trips_like_stdlib(backend, value):
+    assert backend.loads(backend.dumps(value)) == json.loads(json.dumps(value))
+
+
+def test_non_finite_floats_round_trip(backend):
+    decoded = backend.loads(backend.dumps({"nan": float("nan"), "inf": [float("inf"), -float("inf")]}))
+    assert math.isnan(decoded["nan"])
+    assert decoded["inf"] == [float("inf"), -float("inf")]
+
+
+def test_decodes_stdlib_output(backend):
+    encoded = json.dumps({"nan": float("nan"), "wide": 2 ** 70}).encode("utf-8")
+    decoded = backend.loads(memoryview(encoded))
+    assert math.isnan(decoded["nan"])
+    assert decoded["wide"] == 2 ** 70
+
+
+def test_invalid_json_raises(backend):
+    with pytest.raises(ValueError):
+        backend.loads(b"{invalid")
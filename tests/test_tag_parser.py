@@ -0,0 +1,25 @@
+from pipelines.task.helper.tag_parser import IncrementalTagParser, parse_tags
+
+
+# The model sometimes echoes the output schema of the prompt before answering.
+SCHEMA_ECHO = (
+    "I should output <INTENT><DESIRE><GUIDANCE_TYPE><TEXT_GUIDANCE_TITLE> as required.\n"
+    "<INTENT>Pour water</INTENT>"
+)
+
+
+def test_parse_tags_skips_schema_echo():
+    assert parse_tags(SCHEMA_ECHO)["INTENT"] == "Pour water"
+
+
+def test_incremental_parser_skips_schema_echo():
+    parser = IncrementalTagParser()
+    completed = []
+    for start in range(0, len(SCHEMA_ECHO), 5):
+        completed += parser.feed(SCHEMA_ECHO[start:start + 5])
+    assert completed == [("INTENT", "Pour water")]
+
+
+def test_parse_tags_multiline_and_unclosed():
+    fields = parse_tags("<INTENT>Pour\nwater</INTENT><DESIRE>Coffee</DESIRE>\n<GUIDANCE_TYPE>text")
+    assert fields == {"INTENT": "Pour\nwater", "DESIRE": "Coffee", "GUIDANCE_TYPE": "text"}